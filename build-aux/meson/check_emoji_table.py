@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+# Builds the emoji table from the openmoji data kept in precompile/, as the generator does,
+# reads it back through the memory-mapped accessors and compares every field with the source dict.
+
+import os
+import sys
+import json
+import runpy
+import tempfile
+import importlib.util
+from os import path
+
+def load_app_package(srcdir: str):
+    spec = importlib.util.spec_from_file_location('smile', path.join(srcdir, '__init__.py'), submodule_search_locations=[srcdir])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['smile'] = module
+    spec.loader.exec_module(module)
+
+def main():
+    srcdir = sys.argv[1] if len(sys.argv) > 1 else path.join(path.dirname(path.abspath(__file__)), '..', '..', 'src')
+    generator_dir = path.join(srcdir, '..', 'precompile', 'emoji_list')
+
+    load_app_package(srcdir)
+    from smile.lib.emoji_data import EmojiTable
+
+    generator = runpy.run_path(path.join(generator_dir, 'generate_emoji_dict.py'))
+
+    emoji_list = []
+    for filename in ['openmoji.json', 'openmoji_unicode_15.json']:
+        with open(path.join(generator_dir, filename), 'r') as f:
+            emoji_list.extend(json.load(f))
+
+    source = generator['build_emoji_dict'](emoji_list)
+    categories = generator['emoji_categories']
+
+    table_path = path.join(tempfile.mkdtemp(), 'emoji_list.bin')
+    generator['write_emoji_table'](source, categories, table_path)
+    table = EmojiTable(table_path)
+
+    errors = []
+
+    if list(table) != list(source):
+        errors.append('the emojis are not in the order of the source')
+
+    if table.categories != categories:
+        errors.append(f'the categories differ: {table.categories}')
+
+    for hexcode, el in source.items():
+        if not hexcode in table:
+            errors.append(f'{hexcode} is missing')
+            continue
+
+        record = table[hexcode]
+        expected = {
+            'emoji': el['emoji'],
+            'hexcode': el['hexcode'],
+            'group': el['group'],
+            'tags': el['tags'],
+            'order': int(el['order'] or 0),
+        }
+
+        for key, value in expected.items():
+            if record[key] != value:
+                errors.append(f'{hexcode}: {key} is {record[key]!r}, expected {value!r}')
+
+        skintones = el.get('skintones', [])
+        if ('skintones' in record) != bool(skintones):
+            errors.append(f'{hexcode}: "skintones" in the record does not match the source')
+
+        tones = [(t['emoji'], t['hexcode']) for t in record.get('skintones', [])]
+        if tones != [(t['emoji'], t['hexcode']) for t in skintones]:
+            errors.append(f'{hexcode}: the skintones differ')
+
+        for tone in skintones:
+            if tone['hexcode'] in table:
+                errors.append(f'{tone["hexcode"]}: a skintone is found as an emoji')
+
+    for hexcode in ['', '0', 'ZZZZ', None]:
+        if hexcode in table:
+            errors.append(f'{hexcode!r} is found in the table')
+
+    if len(table) != len(source):
+        errors.append(f'the table has {len(table)} emojis, the source {len(source)}')
+
+    for e in errors[:20]:
+        print(e)
+
+    if errors:
+        sys.exit(1)
+
+    print(f'The table matches the source, {len(source)} emojis')
+
+if __name__ == '__main__':
+    main()
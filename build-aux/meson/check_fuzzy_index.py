@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+# Compares the typo-tolerant search with a brute force over the whole vocabulary:
+# the banded edit distance must agree with the full one, and the deletion dictionary
+# must find exactly the words within the allowed distance.
+
+import sys
+import random
+import importlib.util
+from os import path
+
+def load_app_package(srcdir: str):
+    spec = importlib.util.spec_from_file_location('smile', path.join(srcdir, '__init__.py'), submodule_search_locations=[srcdir])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['smile'] = module
+    spec.loader.exec_module(module)
+
+def osa_distance(a: str, b: str) -> int:
+    """Optimal string alignment distance, computed on the whole matrix"""
+    d = [[0] * (len(b) + 1) for i in range(len(a) + 1)]
+
+    for i in range(len(a) + 1):
+        d[i][0] = i
+
+    for j in range(len(b) + 1):
+        d[0][j] = j
+
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + cost)
+
+            if (i > 1) and (j > 1) and (a[i - 1] == b[j - 2]) and (a[i - 2] == b[j - 1]):
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+
+    return d[len(a)][len(b)]
+
+def mutate(word: str, rng: random.Random, edits: int) -> str:
+    """Applies random deletions, insertions, substitutions and transpositions"""
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+
+    for i in range(edits):
+        j = rng.randrange(len(word)) if word else 0
+        kind = rng.choice(['delete', 'insert', 'replace', 'transpose'])
+
+        if kind == 'delete' and len(word) > 1:
+            word = word[:j] + word[j + 1:]
+        elif kind == 'transpose' and j + 1 < len(word):
+            word = word[:j] + word[j + 1] + word[j] + word[j + 2:]
+        elif kind == 'replace' and word:
+            word = word[:j] + rng.choice(letters) + word[j + 1:]
+        else:
+            word = word[:j] + rng.choice(letters) + word[j:]
+
+    return word
+
+def main():
+    srcdir = sys.argv[1] if len(sys.argv) > 1 else path.join(path.dirname(path.abspath(__file__)), '..', '..', 'src')
+
+    load_app_package(srcdir)
+    from smile.lib.emoji_data import emojis
+    from smile.lib.fuzzy_index import FuzzyIndex, edit_distance
+
+    rng = random.Random(42)
+    errors = []
+
+    # the words of the english tags, as the search index collects them
+    words = {}
+    for hexcode, e in emojis.items():
+        for tag in e['tags'].split(','):
+            for word in tag.strip().lower().split():
+                if len(word) >= 3:
+                    words.setdefault(word, set()).add(hexcode)
+
+    vocabulary = sorted(words)
+
+    for i in range(2000):
+        a = rng.choice(vocabulary)
+        b = mutate(a, rng, rng.randint(0, 3)) if rng.random() < 0.7 else rng.choice(vocabulary)
+        max_distance = rng.randint(0, 2)
+
+        expected = osa_distance(a, b)
+        expected = expected if expected <= max_distance else max_distance + 1
+        distance = edit_distance(a, b, max_distance)
+
+        if distance != expected:
+            errors.append(f'edit_distance("{a}", "{b}", {max_distance}) is {distance}, expected {expected}')
+
+    fuzzy_index = FuzzyIndex(words)
+
+    for i in range(40):
+        query = mutate(rng.choice(vocabulary), rng, rng.randint(1, 2))
+        max_distance = rng.randint(1, 2)
+
+        expected = {}
+        for word in vocabulary:
+            if abs(len(word) - len(query)) > max_distance:
+                continue
+
+            distance = osa_distance(query, word)
+            if distance <= max_distance:
+                for hexcode in words[word]:
+                    expected[hexcode] = min(expected.get(hexcode, distance), distance)
+
+        result = fuzzy_index.lookup(query, max_distance)
+
+        if result != expected:
+            missing = sorted(set(expected) - set(result))
+            extra = sorted(set(result) - set(expected))
+            errors.append(f'lookup("{query}", {max_distance}) differs from the brute force: missing {missing[:5]}, extra {extra[:5]}')
+
+    for e in errors[:20]:
+        print(e)
+
+    if errors:
+        sys.exit(1)
+
+    print('The fuzzy index matches the brute force')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+# Types a query one character at a time and checks that each search narrows down
+# the results of the previous one, instead of starting over, and that repeated queries
+# are answered by the results cache.
+
+import os
+import sys
+import tempfile
+import importlib.util
+from os import path
+
+def load_app_package(srcdir: str):
+    spec = importlib.util.spec_from_file_location('smile', path.join(srcdir, '__init__.py'), submodule_search_locations=[srcdir])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['smile'] = module
+    spec.loader.exec_module(module)
+
+def main():
+    srcdir = sys.argv[1] if len(sys.argv) > 1 else path.join(path.dirname(path.abspath(__file__)), '..', '..', 'src')
+    datadir = path.join(srcdir, '..', 'data')
+
+    # no custom tags, as for a new user
+    os.environ['XDG_CONFIG_HOME'] = tempfile.mkdtemp()
+
+    load_app_package(srcdir)
+    from smile.lib.emoji_data import emojis
+    from smile.lib.search_index import EmojiSearchIndex
+    from smile.lib.custom_tags import get_custom_tags_version
+
+    search_index = EmojiSearchIndex(emojis, datadir)
+    errors = []
+
+    def search(query: str):
+        search_index.search(query, [], False, False, history={})
+        return [r.query for r in search_index.results_stack]
+
+    search('heart')
+    version = get_custom_tags_version()
+
+    for i, query in enumerate(['f', 'fi', 'fir', 'fire']):
+        stack = search(query)
+
+        if stack != ['f', 'fi', 'fir', 'fire'][:i + 1]:
+            errors.append(f'"{query}" did not narrow the previous results, the stack is {stack}')
+
+    if get_custom_tags_version() != version:
+        errors.append('the custom tags were reloaded by searching')
+
+    misses = search_index.cache_info()['misses']
+    search('fir')
+    search('heart')
+
+    if search_index.cache_info()['misses'] != misses:
+        errors.append(f'repeated queries missed the cache: {search_index.cache_info()}')
+
+    for e in errors:
+        print(e)
+
+    if errors:
+        sys.exit(1)
+
+    print('Search narrowing works')
+
+if __name__ == '__main__':
+    main()
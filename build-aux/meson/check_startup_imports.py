@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+# Follows the module-level imports of main.py, without running anything,
+# and fails if the startup path reaches a module that only the secondary windows need.
+# Imports inside functions are not followed, that is how those modules are deferred.
+
+import ast
+import sys
+from typing import Optional
+from os import path
+
+# Modules of the app, relative to src/
+DEFERRED_MODULES = [
+    'Settings',
+    'ShortcutsWindow',
+    'components/UpdateDialog',
+]
+
+# Third-party and standard modules, by top-level name
+DEFERRED_PACKAGES = [
+    'manimpango',
+    'dbus',
+    'fontTools',
+    'cairo',
+    'csv',
+]
+
+def get_module_imports(tree: ast.Module):
+    """The import statements executed when the module is loaded"""
+    nodes = list(tree.body)
+
+    while nodes:
+        node = nodes.pop(0)
+
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            yield node
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            continue
+        else:
+            nodes.extend(ast.iter_child_nodes(node))
+
+def resolve_module(srcdir: str, module_path: str) -> Optional[str]:
+    """The file of a module of the app, given its path relative to src/, None for a folder without __init__.py"""
+    if path.isdir(path.join(srcdir, module_path)):
+        init_file = path.join(module_path, '__init__.py')
+        return init_file if path.exists(path.join(srcdir, init_file)) else None
+
+    return module_path + '.py'
+
+def get_dependencies(srcdir: str, module_file: str):
+    with open(path.join(srcdir, module_file), 'r') as f:
+        tree = ast.parse(f.read(), module_file)
+
+    package = path.dirname(module_file)
+
+    for node in get_module_imports(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield ('package', alias.name.split('.')[0])
+            continue
+
+        if node.level == 0:
+            yield ('package', node.module.split('.')[0])
+            continue
+
+        base = package
+        for i in range(node.level - 1):
+            base = path.dirname(base)
+
+        if node.module:
+            target = path.join(base, *node.module.split('.'))
+            yield ('module', resolve_module(srcdir, target))
+
+        # "from . import x" and "from .module import x" might import submodules too
+        for alias in node.names:
+            target = path.join(base, *(node.module.split('.') if node.module else []), alias.name)
+
+            if path.exists(path.join(srcdir, target + '.py')) or path.isdir(path.join(srcdir, target)):
+                yield ('module', resolve_module(srcdir, target))
+
+def main():
+    srcdir = sys.argv[1] if len(sys.argv) > 1 else path.join(path.dirname(path.abspath(__file__)), '..', '..', 'src')
+
+    deferred_files = [resolve_module(srcdir, m) for m in DEFERRED_MODULES]
+
+    # module file -> the module that imported it first, to print the chain
+    imported_by = {'main.py': None}
+    packages = {}
+    queue = ['main.py']
+
+    while queue:
+        module_file = queue.pop(0)
+
+        for kind, name in get_dependencies(srcdir, module_file):
+            if kind == 'package':
+                packages.setdefault(name, module_file)
+            elif name and (name not in imported_by):
+                imported_by[name] = module_file
+                queue.append(name)
+
+    def chain(module_file: str) -> str:
+        modules = []
+        while module_file:
+            modules.insert(0, module_file)
+            module_file = imported_by[module_file]
+
+        return ' -> '.join(modules)
+
+    errors = []
+    for module_file in deferred_files:
+        if module_file in imported_by:
+            errors.append(f'{module_file} is imported at startup: {chain(module_file)}')
+
+    for package in DEFERRED_PACKAGES:
+        if package in packages:
+            errors.append(f'{package} is imported at startup: {chain(packages[package])} -> {package}')
+
+    for e in errors:
+        print(e)
+
+    if errors:
+        sys.exit(1)
+
+    print(f'{len(imported_by)} modules imported at startup, none of them deferred')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+import os
+import sys
+import runpy
+from fontTools import subset
+
+# Codepoints that never start a sequence but glue or modify the ones in the data
+joiners = [
+    0x200D,  # zero width joiner
+    0xFE0F,  # emoji presentation selector
+    0x20E3,  # combining enclosing keycap
+]
+
+def get_sequences(emojis: dict) -> set[str]:
+    """Every string the app can show: the emojis and all their skintone variants"""
+    sequences = set()
+
+    for el in emojis.values():
+        sequences.add(el['emoji'])
+
+        for tone in el.get('skintones', []):
+            sequences.add(tone['emoji'])
+
+    return sequences
+
+def strip_fe0f(codepoints: tuple) -> tuple:
+    return tuple(c for c in codepoints if c != 0xFE0F)
+
+def get_allowed_runs(sequences: set[str]) -> set[tuple]:
+    """Every contiguous run of codepoints of the sequences, without presentation selectors:
+    a ligature may build a sequence in several steps, each one replacing a part of it"""
+    runs = set()
+
+    for sequence in sequences:
+        codepoints = strip_fe0f(tuple(ord(c) for c in sequence))
+
+        for start in range(len(codepoints)):
+            for end in range(start + 2, len(codepoints) + 1):
+                runs.add(codepoints[start:end])
+
+    return runs
+
+def prune_ligatures(font, sequences: set[str]) -> int:
+    """Drops the ligatures forming sequences that are not in the data, returns how many.
+
+    Without this the subsetter keeps every ligature whose codepoints are kept, for instance
+    every flag that can be spelled with the regional indicators of the flags in the data.
+    Ligatures with a component that is not mapped to a codepoint (the output of an earlier
+    substitution) are kept, the closure of the subsetter drops them if they become unreachable.
+    """
+    if not 'GSUB' in font:
+        return 0
+
+    glyph_to_codepoint = {}
+    for codepoint, glyph in font.getBestCmap().items():
+        glyph_to_codepoint.setdefault(glyph, codepoint)
+
+    allowed_runs = get_allowed_runs(sequences)
+    pruned = 0
+
+    for lookup in font['GSUB'].table.LookupList.Lookup:
+        for subtable in lookup.SubTable:
+            if lookup.LookupType == 7:
+                subtable = subtable.ExtSubTable
+
+            if subtable.LookupType != 4:
+                continue
+
+            for first_glyph, ligatures in list(subtable.ligatures.items()):
+                kept = []
+
+                for ligature in ligatures:
+                    glyphs = [first_glyph, *ligature.Component]
+
+                    if all(g in glyph_to_codepoint for g in glyphs):
+                        run = strip_fe0f(tuple(glyph_to_codepoint[g] for g in glyphs))
+
+                        if (len(run) > 1) and (run not in allowed_runs):
+                            pruned += 1
+                            continue
+
+                    kept.append(ligature)
+
+                if kept:
+                    subtable.ligatures[first_glyph] = kept
+                else:
+                    del subtable.ligatures[first_glyph]
+
+    return pruned
+
+def main():
+    _path = os.path.dirname(os.path.abspath(__file__))
+
+    if len(sys.argv) < 2:
+        print(f'Usage: {sys.argv[0]} path/to/NotoColorEmoji.ttf')
+        sys.exit(1)
+
+    source_font = sys.argv[1]
+    destdir = _path + '/../../data/assets'
+
+    emojis = runpy.run_path(_path + '/../../src/lib/emoji_data.py')['emojis']
+    sequences = get_sequences(emojis)
+
+    unicodes = set(joiners)
+    for sequence in sequences:
+        unicodes.update(ord(c) for c in sequence)
+
+    print(f'Subsetting {source_font} to {len(sequences)} sequences ({len(unicodes)} codepoints)')
+
+    options = subset.Options()
+    # the ZWJ sequences, flags and skintone variants are ligatures: keep every GSUB feature
+    # so the closure over the codepoints reaches them, after dropping the ones for other sequences
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    options.name_languages = ['*']
+    options.notdef_outline = True
+    options.glyph_names = False
+
+    font = subset.load_font(source_font, options)
+    print(f'Dropped {prune_ligatures(font, sequences)} ligatures of sequences missing from the data')
+
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=unicodes)
+    subsetter.subset(font)
+
+    os.makedirs(destdir, exist_ok=True)
+    subset.save_font(font, f'{destdir}/NotoColorEmoji.ttf', options)
+
+    source_size = os.path.getsize(source_font) // 1024
+    subset_size = os.path.getsize(f'{destdir}/NotoColorEmoji.ttf') // 1024
+
+    print(f'Generated {destdir}/NotoColorEmoji.ttf ({source_size} KiB -> {subset_size} KiB)')
+
+if __name__ == '__main__':
+    main()
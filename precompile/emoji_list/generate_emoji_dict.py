@@ -1,7 +1,6 @@
 import json
-import requests
+import struct
 import os
-from io import StringIO
 
 problematic = [
     # Skin tones
@@ -56,8 +55,6 @@ emoji_categories = {
     },
 }
 
-components = {}
-
 def append_skintone(skintone: dict, base_hex: str):
     global output
     for e, o in output.items():
@@ -67,32 +64,92 @@ def append_skintone(skintone: dict, base_hex: str):
 
             o['skintones'].append(skintone)
 
-def main():
-    _path = os.path.dirname(os.path.abspath(__file__))
-
-    destdir = os.path.dirname(os.path.abspath(__file__)) + '/../../src/assets'
-
+# The layout of the table, must match src/lib/emoji_data.py
+TABLE_MAGIC = b'SMIL'
+TABLE_VERSION = 1
+HEADER = struct.Struct('<4sHIIIIIII')
+RECORD = struct.Struct('<IHIHIHIIHH')
+INDEX_ENTRY = struct.Struct('<I')
+CATEGORY = struct.Struct('<IHIH')
+
+def write_emoji_table(emojis: dict, categories: dict, path: str):
+    """Writes the fixed-width records, the index sorted by hexcode, the categories and the string pool"""
+    pool = bytearray()
+    pool_strings = {}
+
+    def add_string(string: str) -> tuple[int, int]:
+        if string not in pool_strings:
+            encoded = string.encode('utf-8')
+            pool_strings[string] = (len(pool), len(encoded))
+            pool.extend(encoded)
+
+        return pool_strings[string]
+
+    category_numbers = {c: i for i, c in enumerate(categories)}
+    tones_start = len(emojis)
+
+    records = []
+    tone_records = []
+    for el in emojis.values():
+        skintones = el.get('skintones', [])
+        group = category_numbers[el['group']]
+
+        records.append(RECORD.pack(
+            *add_string(el['emoji']),
+            *add_string(el['hexcode']),
+            *add_string(el['tags']),
+            int(el['order'] or 0),
+            (tones_start + len(tone_records)) if skintones else 0,
+            len(skintones),
+            group
+        ))
+
+        for tone in skintones:
+            # the tags of the variants are never shown nor searched
+            tone_records.append(RECORD.pack(
+                *add_string(tone['emoji']),
+                *add_string(tone['hexcode']),
+                *add_string(''),
+                int(tone['order'] or 0),
+                0,
+                0,
+                group
+            ))
+
+    hexcodes = [el['hexcode'].encode('utf-8') for el in emojis.values()]
+    index = sorted(range(len(hexcodes)), key=lambda n: hexcodes[n])
+
+    category_entries = [CATEGORY.pack(*add_string(c), *add_string(cat['icon'])) for c, cat in categories.items()]
+
+    records_offset = HEADER.size
+    index_offset = records_offset + (len(records) + len(tone_records)) * RECORD.size
+    categories_offset = index_offset + len(index) * INDEX_ENTRY.size
+    pool_offset = categories_offset + len(category_entries) * CATEGORY.size
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(
+            TABLE_MAGIC,
+            TABLE_VERSION,
+            len(records),
+            len(records) + len(tone_records),
+            len(category_entries),
+            records_offset,
+            index_offset,
+            categories_offset,
+            pool_offset
+        ))
+
+        f.write(b''.join(records))
+        f.write(b''.join(tone_records))
+        f.write(b''.join(INDEX_ENTRY.pack(n) for n in index))
+        f.write(b''.join(category_entries))
+        f.write(pool)
+
+def build_emoji_dict(emoji_list: list) -> dict:
+    """Filters and cleans up the openmoji data, returns {hexcode: emoji} with the skintones nested in their emoji"""
     categ = set()
 
-    print('Downloading openmoji.json')
-    openmoji_json = requests.get('https://raw.githubusercontent.com/hfg-gmuend/openmoji/master/data/openmoji.json')
-
-    with open(_path + '/openmoji.json', 'w+') as f:
-        f.write(openmoji_json.text)
-
-    emoji_list = json.load(open(_path + '/openmoji.json', 'r'))
-
-    emoji_list.extend(
-        json.load(open(_path + '/openmoji_unicode_15.json', 'r'))
-    )
-
     for i, el in enumerate(emoji_list):
-        if el['group'] == 'component':
-            if not el['subgroups'] in components:
-                components[ el['subgroups'] ] = {}
-
-            components[el['subgroups']][el['hexcode']] = el
-
         # ignore if an emoji is misbehaving
         
         if (el['hexcode'] in problematic) or (el['group'] == 'extras-openmoji'):
@@ -146,13 +203,31 @@ def main():
         output[el['hexcode']] = el
         categ.add(el['group'])
 
-    output_dict = StringIO()
-    print(f'emojis = {output}\nemoji_categories = {emoji_categories}\ncomponents = {components}', file=output_dict)
+    return output
+
+def main():
+    _path = os.path.dirname(os.path.abspath(__file__))
+
+    destdir = os.path.dirname(os.path.abspath(__file__)) + '/../../src/assets'
+
+    # only needed to download the data
+    import requests
+
+    print('Downloading openmoji.json')
+    openmoji_json = requests.get('https://raw.githubusercontent.com/hfg-gmuend/openmoji/master/data/openmoji.json')
+
+    with open(_path + '/openmoji.json', 'w+') as f:
+        f.write(openmoji_json.text)
+
+    emoji_list = json.load(open(_path + '/openmoji.json', 'r'))
+
+    emoji_list.extend(
+        json.load(open(_path + '/openmoji_unicode_15.json', 'r'))
+    )
 
-    output_file = open(f"{destdir}/emoji_list.py", 'w+')
-    output_file.write(output_dict.getvalue())
+    write_emoji_table(build_emoji_dict(emoji_list), emoji_categories, f"{destdir}/emoji_list.bin")
 
-    print(f"Generated {destdir}/emoji_list.py")
+    print(f"Generated {destdir}/emoji_list.bin")
 
 if __name__ == '__main__':
     main()
@@ -17,23 +17,27 @@
 
 import gi
 import os
-import threading
 import subprocess
-from time import time, time_ns, sleep
+from time import time, time_ns
 from typing import Optional
 import re
 
-from .ShortcutsWindow import ShortcutsWindow
 from .components.CustomTagEntry import CustomTagEntry
 from .components.SkintoneSelector import SkintoneSelector
 from .components.FlowBoxChild import FlowBoxChild
 from .components.EmojiButton import EmojiButton
-from .lib.custom_tags import get_custom_tags
-from .lib.localized_tags import get_localized_tags
+from .components.EmojiCell import EmojiCell
+from .components.EmojiGrid import EmojiGrid, EmojiPool
+from .components.EmojiObject import EmojiObject
+from .lib.app_settings import SettingsSnapshot, get_settings_snapshot
+from .lib.emoji_atlas import load_emoji_atlas, unload_emoji_atlas
 from .lib.emoji_history import increment_emoji_usage_counter, get_history
-from .utils import tag_list_contains, debounce, idle
+from .lib.custom_tags import get_custom_tags_config, get_custom_tags_version
+from .lib.localized_tags import get_tags_locales
+from .lib.search_worker import SearchWorker
+from .utils import debounce, timeout
 from .lib.DbusService import DbusService, DBUS_SERVICE_INTERFACE, DBUS_SERVICE_PATH
-from .assets.emoji_list import emojis, emoji_categories
+from .lib.emoji_data import emojis, emoji_categories
 
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
@@ -45,8 +49,6 @@ class Picker(Gtk.ApplicationWindow):
     def __init__(self, *args, **kwargs):
         super().__init__(title="Smile", resizable=True, *args, **kwargs)
 
-        EMOJI_LIST_MIN_HEIGHT = 320
-
         self.set_default_size(1, 1)
 
         self.last_copied_text = None
@@ -57,17 +59,26 @@ class Picker(Gtk.ApplicationWindow):
         self.add_controller(self.event_controller_keys)
         self.data_dir = Gio.Application.get_default().datadir
 
-        self.settings: Gio.Settings = Gio.Settings.new('it.mijorus.smile')
+        self.settings: SettingsSnapshot = get_settings_snapshot()
         self.settings.connect('changed::skintone-modifier', self.update_emoji_skintones)
+        self.settings.connect('changed::emoji-size-class', self.update_emoji_size_class)
+
+        for key in ['emoji-size-class', 'use-emoji-atlas']:
+            self.settings.connect(f'changed::{key}', self.update_emoji_atlas)
+
+        for key in ['tags-locale', 'tags-locales', 'use-localized-tags', 'merge-english-tags', 'accent-insensitive-search']:
+            self.settings.connect(f'changed::{key}', lambda s, k: self.search_worker.prepare(self.get_search_options()))
 
         self.EMOJI_GRID_COL_N = 5
-        self.emoji_grid_first_row = []
+        self.EMOJI_LIST_MIN_HEIGHT = 320
 
         self.selected_category_index = 0
         self.selected_category = 'smileys-emotion'
         self.query: str = None
+        self.search_worker = SearchWorker(emojis, self.data_dir)
+        self.search_worker.prepare(self.get_search_options())
         self.selection: list[str] = []
-        self.selected_buttons: list[EmojiButton] = []
+        self.selected_items: list[EmojiObject] = []
         
         self.history = []
         # self.history_size = 0
@@ -110,37 +121,22 @@ class Picker(Gtk.ApplicationWindow):
             valign=Gtk.Align.END
         )
 
-        self.emoji_list_widgets: list[FlowBoxChild] = []
-        self.emoji_list = Gtk.FlowBox(
-            valign=Gtk.Align.START,
-            homogeneous=True,
-            css_classes=['emoji_list_box'],
-            margin_top=2,
-            margin_bottom=2,
-            selection_mode=Gtk.SelectionMode.SINGLE,
-            max_children_per_line=self.EMOJI_GRID_COL_N,
-            min_children_per_line=self.EMOJI_GRID_COL_N
-        )
-
+        # Every category gets its own grid, built once and then kept in the stack;
+        # the search results and the recents have a page too
+        self.emoji_pool = EmojiPool()
+        self.emoji_pool.track_focus(self)
+        self.emoji_pages: dict[str, EmojiGrid] = {}
+        self.emoji_stack = Gtk.Stack(vexpand=True, vhomogeneous=False, hhomogeneous=False, transition_type=Gtk.StackTransitionType.NONE)
+        self.emoji_list: EmojiGrid = None
+        self.recents_key = None
+
+        # an atlas already in the cache is opened before the first grid is filled
+        self.update_emoji_atlas(self.settings, 'use-emoji-atlas')
         self.refresh_emoji_list()
         self.category_picker_widgets: list[Gtk.Button] = []
         self.category_picker = self.create_category_picker()
 
-        scrolled_emoji_window = Gtk.ScrolledWindow(
-            min_content_height=EMOJI_LIST_MIN_HEIGHT, 
-            propagate_natural_height=True, 
-            propagate_natural_width=True, 
-            vexpand=True
-        )
-
-        scrolled_emoji_window.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
-        scrolled_container = Adw.Clamp(maximum_size=600)
-
-
-        scrolled_container.set_child(self.emoji_list)
-        scrolled_emoji_window.set_child(scrolled_container)
-
-        emoji_list_overlay_container = Gtk.Overlay(child=scrolled_emoji_window)
+        emoji_list_overlay_container = Gtk.Overlay(child=self.emoji_stack)
 
         emoji_list_overlay_container.add_overlay(self.list_tip_revealer)
         emoji_list_overlay_container.add_overlay(self.select_buffer_revealer)
@@ -153,7 +149,8 @@ class Picker(Gtk.ApplicationWindow):
         # Create search entry
         search_container = Gtk.Box()
 
-        self.search_entry = Gtk.SearchEntry(hexpand=True, width_request=200)
+        # Searches are already debounced by search_emoji
+        self.search_entry = Gtk.SearchEntry(hexpand=True, width_request=200, search_delay=0)
         self.search_entry.connect('search_changed', self.search_emoji)
         self.search_entry.connect('activate', self.handle_search_entry_activate)
         search_container.append(self.search_entry)
@@ -174,7 +171,7 @@ class Picker(Gtk.ApplicationWindow):
 
         self.set_titlebar(header_bar)
 
-        self.shortcut_window: ShortcutsWindow = None
+        self.shortcut_window = None
         self.shift_key_pressed = False
 
         # Display custom tags at the top of the list when searching
@@ -185,17 +182,18 @@ class Picker(Gtk.ApplicationWindow):
         self.overlay.set_child(self.viewport_box)
 
         self.update_emoji_skintones(self.settings, 'skintone-modifier')
+        self.update_emoji_size_class(self.settings, 'emoji-size-class')
         self.set_active_category('smileys-emotion')
 
         self.set_child(self.overlay)
         self.search_entry.grab_focus()
 
+        GLib.idle_add(self.prefetch_emoji_pages, priority=GLib.PRIORITY_LOW)
+
     def on_activation(self):
         self.present_with_time(Gdk.CURRENT_TIME)
         self.grab_focus()
 
-        self.emoji_list.unselect_all()
-
         if self.settings.get_boolean('iconify-on-esc'):
             self.unminimize()
 
@@ -230,90 +228,99 @@ class Picker(Gtk.ApplicationWindow):
 
         return box
 
-    def refresh_emoji_list(self):
-        start = time_ns()
+    def create_emoji_page(self, name: str) -> EmojiGrid:
+        grid = EmojiGrid(
+            columns=self.EMOJI_GRID_COL_N,
+            pool=self.emoji_pool,
+            click_handler=self.handle_emoji_button_click,
+            secondary_click_handler=self.show_skintone_selector,
+            middle_click_handler=self.show_custom_tag_entry,
+            css_classes=['emoji_list_box'],
+            margin_top=2,
+            margin_bottom=2,
+        )
 
-        self.emoji_list.remove_all()
-        self.emoji_list_widgets = []
+        scrolled_emoji_window = Gtk.ScrolledWindow(
+            min_content_height=self.EMOJI_LIST_MIN_HEIGHT, 
+            propagate_natural_height=True, 
+            propagate_natural_width=True, 
+            vexpand=True
+        )
 
-        self.history = get_history()
-        filter_for_recents = self.selected_category == 'recents'
-        tags_locale = self.settings.get_string('tags-locale')
-        merge_english_tags = self.settings.get_boolean('merge-english-tags')
-        tags_locale_is_en = tags_locale == 'en'
-
-        use_localised_tags = self.settings.get_boolean('use-localized-tags') if self.query else False
-
-        for key, emoji in emojis.items():
-            is_recent = (emoji['hexcode'] in self.history)
-
-            if self.query:
-                localized_tags = []
-                filter_result = True
-
-                if use_localised_tags and not tags_locale_is_en:
-                    localized_tags = get_localized_tags(tags_locale, emoji['hexcode'], self.data_dir)
-
-                custom_tags = ''
-                if self.query != emoji['emoji']:
-                    custom_tags = get_custom_tags(emoji['hexcode'], cache=True)
-
-                if self.query == emoji['emoji']:
-                    filter_result = True
-                elif custom_tags and tag_list_contains(custom_tags, self.query):
-                    filter_result = True
-                elif use_localised_tags:
-                    if merge_english_tags:
-                        filter_result = tag_list_contains(','.join(localized_tags), self.query) or tag_list_contains(emoji['tags'], self.query)
-                    else:
-                        filter_result = tag_list_contains(','.join(localized_tags), self.query)
-                elif not use_localised_tags:
-                    filter_result = tag_list_contains(emoji['tags'], self.query)
-                else:
-                    filter_result = False
-                
-                if not filter_result: 
-                    continue
-            else:
-                if filter_for_recents:
-                    if not is_recent:
-                        continue
-                elif emoji['group'] != self.selected_category:
-                    continue
+        scrolled_emoji_window.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        # the grid must be the scrollable child, or it would not know which emojis are in the viewport
+        scrolled_container = Adw.ClampScrollable(maximum_size=600)
+
+        scrolled_container.set_child(grid)
+        scrolled_emoji_window.set_child(scrolled_container)
+
+        self.emoji_stack.add_named(scrolled_emoji_window, name)
+        self.emoji_pages[name] = grid
+
+        # the grids have no sorter, the emojis are inserted already in order
+        if name == 'all':
+            grid.set_emojis(sorted(emojis.values(), key=lambda e: e['order']))
+        elif name in emoji_categories and name != 'recents':
+            grid.set_emojis(sorted((e for e in emojis.values() if e['group'] == name), key=lambda e: e['order']))
 
-            emoji_button = EmojiButton(emoji)
-            emoji_button.connect('clicked', self.handle_emoji_button_click)
+        return grid
 
-            flowbox_child = FlowBoxChild(emoji_button)
+    def get_emoji_page(self, name: str) -> EmojiGrid:
+        return self.emoji_pages[name] if name in self.emoji_pages else self.create_emoji_page(name)
 
-            gesture = Gtk.GestureSingle(button=Gdk.BUTTON_SECONDARY)
-            gesture.connect('end', lambda e, _: self.show_skintone_selector(e.get_widget()))
-            flowbox_child.add_controller(gesture)
+    def prefetch_emoji_pages(self) -> bool:
+        """Builds a missing category page for every idle call, returns False once all of them exist"""
+        for c in emoji_categories:
+            if (c != 'recents') and (not c in self.emoji_pages):
+                self.create_emoji_page(c)
+                return True
+
+        return False
+
+    def refresh_emoji_list(self, search_results: Optional[list] = None):
+        start = time_ns()
 
-            gesture_mid_click = Gtk.GestureSingle(button=Gdk.BUTTON_MIDDLE)
-            gesture_mid_click.connect('end', lambda e, _: self.show_custom_tag_entry(e.get_widget()))
-            flowbox_child.add_controller(gesture_mid_click)
+        self.history = get_history()
+        filter_for_recents = self.selected_category == 'recents'
 
-            self.emoji_list.append(flowbox_child)
-            self.emoji_list_widgets.append(flowbox_child)
+        if (search_results is not None) and self.settings.get_boolean('keep-order-in-search'):
+            # every emoji is already in this page, the search only hides the ones that do not match
+            page_name = 'all'
+            self.get_emoji_page(page_name).set_visible_hexcodes(set(search_results))
+        elif search_results is not None:
+            page_name = 'search'
+            # Search results are already sorted by relevance
+            self.get_emoji_page(page_name).set_emojis([emojis[hexcode] for hexcode in search_results])
+        elif filter_for_recents:
+            page_name = 'recents'
+            recents_key = tuple((h, v['lastUsage']) for h, v in self.history.items())
+
+            # the recents are rebuilt only when the history has changed
+            if (recents_key != self.recents_key) or (not page_name in self.emoji_pages):
+                self.recents_key = recents_key
+                recent_hexcodes = sorted(self.history, key=lambda h: self.history[h]['lastUsage'], reverse=True)
+                self.get_emoji_page(page_name).set_emojis([emojis[h] for h in recent_hexcodes if h in emojis])
+        else:
+            page_name = self.selected_category
 
-        self.emoji_list.set_sort_func(self.sort_emoji_list, None)
+        self.emoji_list = self.get_emoji_page(page_name)
+        self.emoji_stack.set_visible_child_name(page_name)
         # print('Emoji list creation took ' + str((time_ns() - start) / 1000000) + 'ms')
 
     # Handle events
-    def handle_emoji_button_click(self, widget: Gtk.Button):
+    def handle_emoji_button_click(self, widget: EmojiButton):
         widget.get_parent().grab_focus()
 
         if self.settings.get_boolean('mouse-multi-select'):
             if self.shift_key_pressed:
-                self.copy_and_quit(widget)
+                self.copy_and_quit(widget.item)
             else:
-                self.select_emoji_button(widget)
+                self.select_emoji(widget.item)
         else:
             if not self.shift_key_pressed:
-                self.copy_and_quit(widget)
+                self.copy_and_quit(widget.item)
             else:
-                self.select_emoji_button(widget)
+                self.select_emoji(widget.item)
 
     # Handle key-presses
     def handle_window_key_release(self, controller: Gtk.EventController, keyval: int, keycode: int, state: Gdk.ModifierType) -> bool:
@@ -338,16 +345,12 @@ class Picker(Gtk.ApplicationWindow):
         focused_widget = self.get_focus()
         focused_button = None
 
-        if isinstance(focused_widget, FlowBoxChild):
+        if isinstance(focused_widget, EmojiCell):
             focused_button = focused_widget.emoji_button
 
         if self.search_entry is focused_widget.get_parent():
             if (keyval == Gdk.KEY_Down):
-                self.load_first_row()
-                if self.emoji_grid_first_row:
-                    self.emoji_grid_first_row[0].grab_focus()
-                    self.emoji_list.emit('move-cursor', Gtk.MovementStep.BUFFER_ENDS, -1, False, False)
-
+                self.emoji_list.focus_first()
                 return True
 
         if alt_key:
@@ -378,7 +381,7 @@ class Picker(Gtk.ApplicationWindow):
         if shift_key:
             if (keyval == Gdk.KEY_Return):
                 if focused_button:
-                    self.select_emoji_button(focused_button)
+                    self.select_emoji(focused_button.item)
                     return True
 
             if (keyval == Gdk.KEY_BackSpace):
@@ -389,6 +392,8 @@ class Picker(Gtk.ApplicationWindow):
 
         elif ctrl_key:
             if keyval == Gdk.KEY_question:
+                from .ShortcutsWindow import ShortcutsWindow
+
                 shortcut_window = ShortcutsWindow()
                 shortcut_window.open()
 
@@ -412,14 +417,14 @@ class Picker(Gtk.ApplicationWindow):
             if focused_button:
                 # Focus is on an emoji button
                 if (keyval == Gdk.KEY_Return):
-                    self.copy_and_quit(focused_button)
+                    self.copy_and_quit(focused_button.item)
                     return True
                 elif (not is_modifier) and (len(keyval_name) == 1) and re.match(r'\S', keyval_name):
                     self.search_entry.insert_text(keyval_name, -1)
                     self.search_entry.set_position(-1)
                     self.search_entry.grab_focus()
                     return True
-                elif (keyval == Gdk.KEY_Up) and (focused_widget in self.emoji_grid_first_row):
+                elif (keyval == Gdk.KEY_Up) and (focused_widget.get_position() < self.EMOJI_GRID_COL_N):
                     self.search_entry.grab_focus()
 
             elif isinstance(focused_widget, Gtk.Button) and hasattr(focused_widget, 'category'):
@@ -431,16 +436,7 @@ class Picker(Gtk.ApplicationWindow):
                 else:
                     if (keyval == Gdk.KEY_Up):
                         self.set_active_category(focused_widget.category)
-
-                        for f in self.emoji_list_widgets:
-                            if self.selected_category == 'recents':
-                                if f.emoji_button.hexcode in get_history():
-                                    f.emoji_button.grab_focus()
-                                    break
-                            else:
-                                if f.emoji_button.emoji_data['group'] == self.selected_category:
-                                    f.emoji_button.grab_focus()
-                                    break
+                        self.emoji_list.focus_first()
 
                     return True
 
@@ -455,7 +451,7 @@ class Picker(Gtk.ApplicationWindow):
         if shift_key:
             self.shift_key_pressed = True
             if (keyval == Gdk.KEY_Return):
-                self.select_emoji_button(focused_widget.emoji_button)
+                self.select_emoji(focused_widget.item)
                 return True
 
             elif (keyval == Gdk.KEY_BackSpace):
@@ -465,16 +461,16 @@ class Picker(Gtk.ApplicationWindow):
         else:
             if (keyval == Gdk.KEY_Return):
                 self.skintone_selector.request_close()
-                self.copy_and_quit(focused_widget.emoji_button)
+                self.copy_and_quit(focused_widget.item)
                 return True
 
         return False
 
     def handle_search_entry_activate(self, entry: Gtk.Entry):
         if self.query:
-            self.load_first_row()
-            if self.emoji_grid_first_row:
-                self.copy_and_quit(self.emoji_grid_first_row[0].emoji_button)
+            first_item = self.emoji_list.get_first_item()
+            if first_item:
+                self.copy_and_quit(first_item)
 
     def send_paste_signal(self):
         if not self.settings.get_boolean('auto-paste') or not self.last_copied_text:
@@ -493,50 +489,46 @@ class Picker(Gtk.ApplicationWindow):
         self.selection = []
         self.set_empty_recent_tip(None)
 
-        for button in self.selected_buttons:
-            button.get_parent().deselect()
-
-        for button in self.emoji_list_widgets:
-            button.deselect()
+        for item in self.selected_items:
+            item.deselect()
 
-        self.selected_buttons = []
+        self.emoji_pool.deselect_all()
+        self.selected_items = []
 
         if self.settings.get_boolean('iconify-on-esc'):
             self.minimize()
             if paste_on_exit: self.send_paste_signal()
         elif not self.settings.get_boolean('load-hidden-on-startup'):
-            # async to avoid blocking the main thread
+            # paste once the window is hidden, without blocking the main thread
             def close_patch():
-                GLib.idle_add(lambda: self.hide())
-                sleep(0.5)
                 if paste_on_exit: self.send_paste_signal()
+                self.close()
 
-                return GLib.idle_add(lambda: self.close())
-
-            threading.Thread(target=close_patch).start()
+            self.hide()
+            timeout(0.5, close_patch)
         else:
             self.set_visible(False)
             if paste_on_exit: self.send_paste_signal()
 
     # # # # # #
-    def show_skintone_selector(self, focused_widget: FlowBoxChild):
-        self.emoji_list.select_child(focused_widget)
+    def show_skintone_selector(self, focused_widget: EmojiCell):
+        focused_widget.grab_focus()
 
-        if not SkintoneSelector.check_skintone(focused_widget):
+        if not SkintoneSelector.check_skintone(focused_widget.item):
             self.overlay.add_toast(
                 Adw.Toast(title=_("No skintones available"), timeout=1)
             )
         else:
             self.skintone_selector = SkintoneSelector(
-                focused_widget,
+                focused_widget.item,
                 parent=self,
                 click_handler=self.handle_emoji_button_click,
                 keypress_handler=self.handle_skintone_selector_key_press,
-                emoji_active_selection=self.selected_buttons
+                emoji_active_selection=self.selected_items
             )
 
-    def show_custom_tag_entry(self, focused_widget: FlowBoxChild):
-        CustomTagEntry(focused_widget, self)
+    def show_custom_tag_entry(self, focused_widget: EmojiCell):
+        CustomTagEntry(focused_widget.item, self)
 
     def set_empty_recent_tip(self, enabled: bool):
         self.list_tip_revealer.set_visible(enabled)
@@ -557,18 +549,17 @@ class Picker(Gtk.ApplicationWindow):
             else:
                 b.get_style_context().add_class('selected')
 
-    def select_emoji_button(self, button: EmojiButton):
-        self.selected_buttons.append(button)
-        self.selection.append(button.get_label())
-        self.emoji_list.select_child(button.get_parent())
+    def select_emoji(self, item: EmojiObject):
+        self.selected_items.append(item)
+        self.selection.append(item.label)
 
-        increment_emoji_usage_counter(button)
+        increment_emoji_usage_counter(item)
 
-        button.get_parent().set_as_selected()
-        button.get_parent().set_as_active()
+        item.set_as_selected()
+        item.set_as_active()
 
-        if button.base_skintone_widget:
-            button.base_skintone_widget.set_as_selected()
+        if item.base_item:
+            item.base_item.set_as_selected()
 
         self.update_selection_content(self.selection)
 
@@ -576,38 +567,33 @@ class Picker(Gtk.ApplicationWindow):
         if not self.selection:
             return
 
-        last_button = self.selected_buttons[-1]
+        last_item = self.selected_items[-1]
 
         self.selection.pop()
-        self.selected_buttons.pop()
+        self.selected_items.pop()
 
-        if not last_button.get_label() in self.selection:
-            last_button.get_parent().deselect()
+        if not last_item in self.selected_items:
+            last_item.deselect()
 
-        if last_button.base_skintone_widget:
-            base_skintone_widget_is_selected = False
+        if last_item.base_item:
+            base_item_is_selected = False
 
-            for sb in self.selected_buttons:
-                if sb.base_skintone_widget is last_button.base_skintone_widget:
-                    base_skintone_widget_is_selected = True
+            for si in self.selected_items:
+                if si.base_item is last_item.base_item:
+                    base_item_is_selected = True
                     break
 
-            if not base_skintone_widget_is_selected:
-                last_button.base_skintone_widget.deselect()
+            if not base_item_is_selected:
+                last_item.base_item.deselect()
 
         self.update_selection_content(self.selection)
 
-    def load_first_row(self):
-        self.emoji_grid_first_row = []
-        for widget in self.emoji_list_widgets:
-            if (len(self.emoji_grid_first_row) < self.EMOJI_GRID_COL_N) and widget.props.visible:
-                self.emoji_grid_first_row.append(widget)
-
     def filter_for_category(self, widget: Gtk.Button):
         self.set_active_category(widget.category)
         widget.grab_focus()
 
         self.query = None
+        self.search_worker.cancel()
         self.selected_category = widget.category
         self.selected_category_index = widget.index
 
@@ -615,13 +601,12 @@ class Picker(Gtk.ApplicationWindow):
         self.set_empty_recent_tip(show_empty_recent_tip)
 
         self.refresh_emoji_list()
-        self.load_first_row()
 
-    def copy_and_quit(self, button: Gtk.Button = None):
+    def copy_and_quit(self, item: EmojiObject = None):
         text = ''
-        if button:
-            text = button.get_label()
-            increment_emoji_usage_counter(button)
+        if item:
+            text = item.label
+            increment_emoji_usage_counter(item)
 
         copied_text = ''.join([*self.selection, text])
         contx = Gdk.ContentProvider.new_for_value(copied_text)
@@ -639,8 +624,7 @@ class Picker(Gtk.ApplicationWindow):
 
         self.default_hiding_action()
 
-    @debounce(0.2)
-    @idle
+    @debounce(0.15)
     def search_emoji(self, search_entry: str):
         start = time_ns()
 
@@ -649,35 +633,46 @@ class Picker(Gtk.ApplicationWindow):
 
         self.query = query if query else None
 
-        self.refresh_emoji_list()
-        self.emoji_list.invalidate_sort()
+        if self.query:
+            self.search_worker.search(self.query, self.get_search_options(), self.refresh_emoji_list)
+        else:
+            self.search_worker.cancel()
+            self.refresh_emoji_list()
         # print('Search took ' + str((time_ns() - start) / 1000000) + 'ms')
 
-    def sort_emoji_list(self, child1: Gtk.FlowBoxChild, child2: Gtk.FlowBoxChild, user_data):
-        child1 = child1.get_child()
-        child2 = child2.get_child()
-
-        if (self.selected_category == 'recents'):
-            h1 = self.history[child1.hexcode] if child1.hexcode in self.history else None
-            h2 = self.history[child2.hexcode] if child2.hexcode in self.history else None
-            return ((h2['lastUsage'] if h2 else 0) - (h1['lastUsage'] if h1 else 0))
-
-        elif self.query:
-            return -1 if get_custom_tags(child1.hexcode, True) else 1
-
+    def get_search_options(self) -> dict:
+        """A snapshot of everything the search depends on, safe to be used by the search worker"""
+        return {
+            'tags_locales': get_tags_locales(self.settings),
+            'use_localized_tags': self.settings.get_boolean('use-localized-tags'),
+            'merge_english_tags': self.settings.get_boolean('merge-english-tags'),
+            'fuzzy': self.settings.get_boolean('fuzzy-search'),
+            'accent_insensitive': self.settings.get_boolean('accent-insensitive-search'),
+            'history': dict(get_history() or {}),
+            'custom_tags': (get_custom_tags_config(), get_custom_tags_version()),
+        }
+
+    def update_emoji_size_class(self, settings: Gio.Settings, key):
+        # a single class on the container sets the font size of every emoji button
+        self.emoji_stack.set_css_classes([self.settings.get_string('emoji-size-class')])
+
+    def update_emoji_atlas(self, settings: Gio.Settings, key):
+        if self.settings.get_boolean('use-emoji-atlas'):
+            scale = max([m.get_scale_factor() for m in self.get_display().get_monitors()] or [1])
+
+            load_emoji_atlas(
+                self.settings.get_string('emoji-size-class'),
+                scale,
+                self.data_dir + '/assets/NotoColorEmoji.ttf',
+                self.refresh_emoji_cells
+            )
         else:
-            return (child1.emoji_data['order'] - child2.emoji_data['order'])
+            unload_emoji_atlas()
+            self.refresh_emoji_cells()
+
+    def refresh_emoji_cells(self):
+        for item in self.emoji_pool.items.values():
+            item.update_cells()
 
     def update_emoji_skintones(self, settings: Gio.Settings, key):
-        modifier_settings = self.settings.get_string('skintone-modifier')
-        for child in self.emoji_list_widgets:
-            emoji_button = child.emoji_button
-
-            if 'skintones' in emoji_button.emoji_data:
-                if len(modifier_settings):
-                    for tone in emoji_button.emoji_data['skintones']:
-                        if f'-{modifier_settings}' in tone['hexcode']:
-                            emoji_button.set_label(tone['emoji'])
-                            break
-                else:
-                    emoji_button.set_label(emoji_button.emoji_data['emoji'])
+        self.emoji_pool.set_skintone(self.settings.get_string('skintone-modifier'))
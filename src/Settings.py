@@ -4,10 +4,10 @@ import json
 from datetime import datetime
 
 from dbus import Array as DBusArray
-from .assets.emoji_list import emojis
-from .lib.user_config import read_json_config, save_json_config
-from .lib.custom_tags import set_custom_tags, get_all_custom_tags, delete_custom_tags
-from .lib.localized_tags import get_countries_list
+from .lib.emoji_data import emojis
+from .lib.user_config import read_json_config
+from .lib.custom_tags import set_custom_tags, get_all_custom_tags, delete_custom_tags, replace_custom_tags
+from .lib.localized_tags import get_countries_list, get_tags_locales
 from .utils import portal
 from .components.UrlRow import UriRow
 from .lib.DbusService import DbusService, GNOME_EXTENSION_LINK
@@ -22,9 +22,6 @@ class Settings(Adw.PreferencesWindow):
         self.application_id = application_id
         self.settings = Gio.Settings.new('it.mijorus.smile')
 
-        if self.settings.get_string('tags-locale') == 'en':
-            self.settings.set_string('tags-locale', 'da')
-
         self.page1 = Adw.PreferencesPage(title=_('Settings'), icon_name='smile-settings-symbolic')
 
         # General group
@@ -37,6 +34,22 @@ class Settings(Adw.PreferencesWindow):
             self.create_boolean_settings_entry(_('Minimize on exit'), 'iconify-on-esc',  _('Minimize the window when selecting an emoji'))
         )
 
+        general_group.add(
+            self.create_boolean_settings_entry(_('Typo-tolerant search'), 'fuzzy-search',  _('Also show emojis with a tag that is one or two typos away from the search'))
+        )
+
+        general_group.add(
+            self.create_boolean_settings_entry(_('Ignore accents'), 'accent-insensitive-search',  _('Find emojis tagged "café" by searching "cafe"'))
+        )
+
+        general_group.add(
+            self.create_boolean_settings_entry(_('Keep emoji order when searching'), 'keep-order-in-search',  _('Hide the emojis that do not match instead of sorting the results by relevance'))
+        )
+
+        general_group.add(
+            self.create_boolean_settings_entry(_('Pre-rendered emojis'), 'use-emoji-atlas',  _('Draw the emojis from images saved in the cache, so they are rendered only once'))
+        )
+
         general_group.add(self.create_launch_shortcut_settings_entry())
 
         # Mouse group
@@ -84,7 +97,7 @@ class Settings(Adw.PreferencesWindow):
                 'merge-english-tags',
                 _('Use both localized tags and English ones at the same time')
             ),
-            self.create_tags_locale_combo_boxes()
+            self.create_tags_locales_row()
         ]
 
         [self.localized_tags_group.add(item) for item in self.localized_tags_group_items]
@@ -168,28 +181,28 @@ class Settings(Adw.PreferencesWindow):
                 margin_end=5,
             )
 
-            for e, data in emojis.items():
-                if (e == hexcode):
-                    label = Gtk.Label(label=data['emoji'], halign=Gtk.Align.START, css_classes=['title-2'])
-                    box.append(label)
+            data = emojis.get(hexcode)
+            if not data:
+                continue
 
-                    entry = Gtk.Entry(text=config['tags'], width_chars=35)
-                    entry.hexcode = hexcode
-                    box.append(entry)
+            label = Gtk.Label(label=data['emoji'], halign=Gtk.Align.START, css_classes=['title-2'])
+            box.append(label)
 
-                    delete_button = Gtk.Button(label=_("Remove"), css_classes=['destructive-action'])
-                    delete_button.hexcode = e
-                    delete_button.connect('clicked', lambda w: self.delete_tag(w.hexcode))
+            entry = Gtk.Entry(text=config['tags'], width_chars=35)
+            entry.hexcode = hexcode
+            box.append(entry)
 
-                    box.append(delete_button)
+            delete_button = Gtk.Button(label=_("Remove"), css_classes=['destructive-action'])
+            delete_button.hexcode = hexcode
+            delete_button.connect('clicked', lambda w: self.delete_tag(w.hexcode))
 
-                    listbox_row.__entry = entry
-                    listbox_row.hexcode = hexcode
+            box.append(delete_button)
 
-                    listbox_row.set_child(box)
-                    rows.append(listbox_row)
+            listbox_row.__entry = entry
+            listbox_row.hexcode = hexcode
 
-                    break
+            listbox_row.set_child(box)
+            rows.append(listbox_row)
 
         self.export_button.set_sensitive(len(rows) > 0)
 
@@ -243,23 +256,39 @@ class Settings(Adw.PreferencesWindow):
         row.add_suffix(emoji_size_combo)
         return row
 
-    def create_tags_locale_combo_boxes(self) -> Adw.ActionRow:
-        row = Adw.ActionRow(title=_('Localized tags'))
-        locales_combo = Gtk.ComboBoxText(valign=Gtk.Align.CENTER)
+    def create_tags_locales_row(self) -> Adw.ExpanderRow:
+        row = Adw.ExpanderRow(title=_('Languages'), subtitle=_('Tags in all the selected languages are searched together'))
+        selected_locales = get_tags_locales(self.settings)
 
-        i = 0
         for k, v in get_countries_list().items():
-            locales_combo.append(k, v['flag'] + ' ' + k.upper())
+            locale_row = Adw.ActionRow(title=v['flag'] + ' ' + v['language'])
 
-            if self.settings.get_string('tags-locale') == k:
-                locales_combo.set_active(i)
+            switch = Gtk.Switch(valign=Gtk.Align.CENTER, active=(k in selected_locales))
+            switch.locale = k
+            switch.connect('notify::active', self.on_tags_locale_switch_toggled)
 
-            i += 1
+            locale_row.add_suffix(switch)
+            locale_row.set_activatable_widget(switch)
+            row.add_row(locale_row)
 
-        locales_combo.connect('changed', lambda w: self.settings.set_string('tags-locale', w.get_active_id()))
-        row.add_suffix(locales_combo)
         return row
 
+    def on_tags_locale_switch_toggled(self, switch: Gtk.Switch, _):
+        selected_locales = get_tags_locales(self.settings)
+
+        locales = []
+        for k in get_countries_list().keys():
+            if k == switch.locale:
+                if switch.get_active():
+                    locales.append(k)
+            elif k in selected_locales:
+                locales.append(k)
+
+        self.settings.set_strv('tags-locales', locales)
+
+        # keep the single locale of older versions in sync
+        self.settings.set_string('tags-locale', locales[0] if locales else 'en')
+
     def on_settings_changes(self, settings, key: str):
         callback = getattr(self, f"on_{key.replace('-', '_')}_changed", None)
 
@@ -314,7 +343,7 @@ class Settings(Adw.PreferencesWindow):
 
                 if isinstance(restore, dict) and any(em in emojis.keys() for em in restore.keys()):
                     print('Restoring from backup...')
-                    save_json_config(restore, 'custom_tags')
+                    replace_custom_tags(restore)
 
                     [self.custom_tags_list_box.remove(r) for r in self.custom_tags_rows]
 
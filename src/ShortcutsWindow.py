@@ -1,10 +1,4 @@
-import sys
 import gi
-import time
-import os
-import csv
-import re
-from .assets.emoji_list import emojis
 
 gi.require_version('Gtk', '4.0')
 
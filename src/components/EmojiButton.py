@@ -1,31 +1,56 @@
 import gi
 from .CustomTagEntry import CustomTagEntry
+from .EmojiObject import EmojiObject
+from .EmojiImage import EmojiImage
+from ..lib.emoji_atlas import get_emoji_atlas
 
 gi.require_version('Gtk', '4.0')
 
-from gi.repository import Gtk, Gio  # noqa
+from gi.repository import Gtk  # noqa
 
 
 class EmojiButton(Gtk.Button):
-    def __init__(self, data: dict, **kwargs):
-        super().__init__(label=data['emoji'], **kwargs)
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
 
-        self.app_settings = Gio.Settings.new('it.mijorus.smile')
-
-        self.emoji_data = data
-        self.hexcode = data['hexcode']
+        self.item: EmojiObject = None
+        self.emoji_data = None
+        self.hexcode = None
         self.history = None
-        
-        self.base_skintone_widget = None
+        self.image: EmojiImage = None
+
+    def bind(self, item: EmojiObject):
+        self.item = item
+        self.emoji_data = item.emoji_data
+        self.hexcode = item.hexcode
 
+        self.set_emoji_label(item.label)
         self.update_css_classes()
 
-        self.app_settings.connect('changed::emoji-size-class', lambda w, val: self.update_css_classes())
+    def set_emoji_label(self, label: str):
+        """Shows the emoji from the atlas when there is one, as text otherwise"""
+        atlas = get_emoji_atlas()
+        slot = atlas.get_slot(label) if atlas else None
+
+        if slot is None:
+            if self.get_label() != label:
+                self.set_label(label)
+
+            return
+
+        if not self.image:
+            self.image = EmojiImage()
+
+        if self.get_child() is not self.image:
+            self.set_child(self.image)
+
+        self.image.set_emoji(atlas, slot)
 
     def update_css_classes(self):
-        self.emoji_button_css = [self.app_settings.get_string('emoji-size-class')]
+        # the font size comes from the emoji-size-class of the container
+        self.emoji_button_css = ['emoji']
 
-        if ('skintones' in self.emoji_data) and self.emoji_data['skintones']:
+        if self.emoji_data and ('skintones' in self.emoji_data) and self.emoji_data['skintones']:
             self.emoji_button_css.append('emoji-with-skintones')
-            
+
         self.set_css_classes(self.emoji_button_css)
@@ -0,0 +1,64 @@
+import gi
+from .EmojiButton import EmojiButton
+from .EmojiObject import EmojiObject
+
+gi.require_version('Gtk', '4.0')
+
+from gi.repository import Gtk  # noqa
+
+
+class EmojiCell(Gtk.Box):
+    """A cell of the emoji grid; the grid creates just enough of them to fill
+    the viewport and binds them to a different item while scrolling"""
+
+    def __init__(self, **kwargs):
+        super().__init__(focusable=True, **kwargs)
+
+        self.item: EmojiObject = None
+        self.list_item: Gtk.ListItem = None
+
+        self.emoji_button = EmojiButton(can_focus=False, hexpand=True)
+        self.default_css = ['flowbox-child-custom']
+
+        self.append(self.emoji_button)
+
+    def bind(self, item: EmojiObject, list_item: Gtk.ListItem):
+        self.item = item
+        self.list_item = list_item
+        item.add_cell(self)
+
+        self.default_css = ['flowbox-child-custom']
+        if ('skintones' in item.emoji_data) and item.emoji_data['skintones']:
+            self.default_css.append('emoji-with-skintones')
+
+        self.emoji_button.bind(item)
+        self.update_state()
+
+    def unbind(self):
+        if self.item:
+            self.item.remove_cell(self)
+
+        self.item = None
+        self.list_item = None
+
+    def get_position(self) -> int:
+        return self.list_item.get_position() if self.list_item else Gtk.INVALID_LIST_POSITION
+
+    # Called by the focus tracker of the EmojiPool
+    def on_selection_enter(self):
+        self.set_css_classes(self.default_css)
+
+    def on_selection_leave(self):
+        if self.item:
+            self.item.is_active = False
+            self.item.update_cells()
+
+    def update_state(self):
+        self.emoji_button.set_emoji_label(self.item.label)
+
+        if self.item.is_active:
+            self.set_css_classes([*self.default_css, 'active'])
+        elif self.item.is_selected:
+            self.set_css_classes([*self.default_css, 'selected'])
+        else:
+            self.set_css_classes(self.default_css)
@@ -0,0 +1,232 @@
+import gi
+from typing import Optional
+from .EmojiCell import EmojiCell
+from .EmojiObject import EmojiObject
+from ..utils import cancel_timeout
+
+gi.require_version('Gtk', '4.0')
+gi.require_version('Gdk', '4.0')
+
+from gi.repository import Gtk, Gio, Gdk, GLib  # noqa
+
+
+class EmojiPool():
+    """Items and cells shared by all the grids of a window.
+
+    Items are created once per hexcode, so an emoji keeps its selection state
+    in every grid showing it; cells released by a grid can be reused by any other one.
+    """
+
+    def __init__(self):
+        self.items: dict[str, EmojiObject] = {}
+        self.cells: list[EmojiCell] = []
+        self.skintone_modifier = ''
+        self.focused_cell: Optional[EmojiCell] = None
+
+    def track_focus(self, window: Gtk.Window):
+        """Follows the focus of the window, instead of a focus controller on every cell"""
+        window.connect('notify::focus-widget', self.on_focus_widget_changed)
+
+    def on_focus_widget_changed(self, window: Gtk.Window, pspec):
+        focus_widget = window.get_focus()
+
+        if self.focused_cell is focus_widget:
+            return
+
+        if self.focused_cell:
+            self.focused_cell.on_selection_leave()
+
+        self.focused_cell = focus_widget if isinstance(focus_widget, EmojiCell) else None
+
+        if self.focused_cell:
+            self.focused_cell.on_selection_enter()
+
+    def get_item(self, emoji: dict) -> EmojiObject:
+        item = self.items.get(emoji['hexcode'])
+
+        if not item:
+            item = EmojiObject(emoji)
+            item.set_skintone(self.skintone_modifier)
+            self.items[item.hexcode] = item
+
+        return item
+
+    def deselect_all(self):
+        for item in self.items.values():
+            item.deselect()
+
+    def set_skintone(self, modifier: str):
+        self.skintone_modifier = modifier
+
+        for item in self.items.values():
+            item.set_skintone(modifier)
+            item.update_cells()
+
+
+class EmojiGrid(Gtk.GridView):
+    """Grid of emojis backed by a list model.
+
+    Only the cells in the viewport (plus a few more) are created,
+    and they get bound to a different item of the model while scrolling,
+    so the number of widgets does not depend on the number of emojis being shown.
+
+    Items and cells come from an EmojiPool, so refreshing the grid mostly reuses
+    existing objects: the grid keeps the cell of an item that is still in the model,
+    and the others are rebound.
+    """
+
+    # rows inserted at once: the first chunk fills the viewport,
+    # the following ones are appended by idle callbacks
+    CHUNK_ROWS = 10
+
+    def __init__(self, columns: int, pool: EmojiPool, click_handler: callable, secondary_click_handler: callable, middle_click_handler: callable, **kwargs):
+        super().__init__(min_columns=columns, max_columns=columns, **kwargs)
+
+        self.click_handler = click_handler
+        self.secondary_click_handler = secondary_click_handler
+        self.middle_click_handler = middle_click_handler
+        self.pool = pool
+
+        # one gesture for the whole grid, the target cell is found with pick()
+        click_gesture = Gtk.GestureClick(button=0)
+        click_gesture.connect('released', self.on_click_released)
+        self.add_controller(click_gesture)
+
+        self.pending_emojis: list[dict] = []
+        self.pending_source_id = None
+
+        self.store = Gio.ListStore(item_type=EmojiObject)
+
+        # the filter is only set while some emojis are hidden
+        self.visible_hexcodes: Optional[set] = None
+        self.emoji_filter = Gtk.CustomFilter.new(self.filter_emoji, None)
+        self.filter_model = Gtk.FilterListModel(model=self.store)
+
+        factory = Gtk.SignalListItemFactory()
+        factory.connect('setup', self.on_factory_setup)
+        factory.connect('bind', self.on_factory_bind)
+        factory.connect('unbind', self.on_factory_unbind)
+        factory.connect('teardown', self.on_factory_teardown)
+
+        self.set_factory(factory)
+        self.set_model(Gtk.NoSelection(model=self.filter_model))
+
+    def on_factory_setup(self, factory: Gtk.SignalListItemFactory, list_item: Gtk.ListItem):
+        list_item.set_child(self.pool.cells.pop() if self.pool.cells else self.create_cell())
+
+    def create_cell(self) -> EmojiCell:
+        cell = EmojiCell()
+        cell.emoji_button.connect('clicked', self.click_handler)
+
+        return cell
+
+    def get_cell_at(self, x: float, y: float) -> Optional[EmojiCell]:
+        widget = self.pick(x, y, Gtk.PickFlags.DEFAULT)
+
+        while widget and (widget is not self):
+            if isinstance(widget, EmojiCell):
+                return widget if widget.item else None
+
+            widget = widget.get_parent()
+
+        return None
+
+    def on_click_released(self, gesture: Gtk.GestureClick, n_press: int, x: float, y: float):
+        button = gesture.get_current_button()
+
+        if not button in [Gdk.BUTTON_SECONDARY, Gdk.BUTTON_MIDDLE]:
+            return
+
+        cell = self.get_cell_at(x, y)
+
+        if not cell:
+            return
+
+        if button == Gdk.BUTTON_SECONDARY:
+            self.secondary_click_handler(cell)
+        else:
+            self.middle_click_handler(cell)
+
+    def on_factory_bind(self, factory: Gtk.SignalListItemFactory, list_item: Gtk.ListItem):
+        list_item.get_child().bind(list_item.get_item(), list_item)
+
+    def on_factory_unbind(self, factory: Gtk.SignalListItemFactory, list_item: Gtk.ListItem):
+        list_item.get_child().unbind()
+
+    def on_factory_teardown(self, factory: Gtk.SignalListItemFactory, list_item: Gtk.ListItem):
+        cell = list_item.get_child()
+        list_item.set_child(None)
+
+        if cell:
+            self.pool.cells.append(cell)
+
+    def set_emojis(self, emojis: list[dict]):
+        """Replaces the content of the grid, the emojis are shown in the given order.
+
+        Only the first chunk is inserted right away, so it can be drawn in the next frame;
+        the other emojis are appended from idle callbacks, which a new call cancels.
+        """
+        cancel_timeout(self.pending_source_id)
+        self.pending_source_id = None
+
+        chunk_size = self.get_max_columns() * self.CHUNK_ROWS
+        items = [self.pool.get_item(emoji) for emoji in emojis[:chunk_size]]
+        self.pending_emojis = emojis[chunk_size:]
+
+        self.store.splice(0, self.store.get_n_items(), items)
+
+        if items:
+            self.scroll_to(0, Gtk.ListScrollFlags.NONE, None)
+
+        if self.pending_emojis:
+            self.pending_source_id = GLib.idle_add(self.append_pending_emojis)
+
+    def append_pending_emojis(self) -> bool:
+        chunk_size = self.get_max_columns() * self.CHUNK_ROWS
+        chunk = self.pending_emojis[:chunk_size]
+        self.pending_emojis = self.pending_emojis[chunk_size:]
+
+        self.store.splice(self.store.get_n_items(), 0, [self.pool.get_item(emoji) for emoji in chunk])
+
+        if self.pending_emojis:
+            return GLib.SOURCE_CONTINUE
+
+        self.pending_source_id = None
+        return GLib.SOURCE_REMOVE
+
+    def filter_emoji(self, item: EmojiObject, user_data) -> bool:
+        return item.hexcode in self.visible_hexcodes
+
+    def set_visible_hexcodes(self, hexcodes: Optional[set]):
+        """Hides every emoji not in hexcodes, or shows all of them if hexcodes is None.
+
+        The model and the items stay the same, the filter only checks each item against the set;
+        when the new set is a subset or a superset of the previous one (as when typing or deleting
+        a character) the filter model only needs to check the items that were visible or hidden.
+        """
+        previous_hexcodes = self.visible_hexcodes
+        self.visible_hexcodes = hexcodes
+
+        if hexcodes is None:
+            self.filter_model.set_filter(None)
+        elif previous_hexcodes is None:
+            self.filter_model.set_filter(self.emoji_filter)
+        elif hexcodes <= previous_hexcodes:
+            self.emoji_filter.changed(Gtk.FilterChange.MORE_STRICT)
+        elif hexcodes >= previous_hexcodes:
+            self.emoji_filter.changed(Gtk.FilterChange.LESS_STRICT)
+        else:
+            self.emoji_filter.changed(Gtk.FilterChange.DIFFERENT)
+
+        if self.filter_model.get_n_items():
+            self.scroll_to(0, Gtk.ListScrollFlags.NONE, None)
+
+    def get_first_item(self) -> Optional[EmojiObject]:
+        return self.filter_model.get_item(0)
+
+    def focus_first(self) -> bool:
+        if not self.filter_model.get_n_items():
+            return False
+
+        self.scroll_to(0, Gtk.ListScrollFlags.FOCUS, None)
+        return True
@@ -0,0 +1,53 @@
+import gi
+from ..lib.emoji_atlas import EmojiAtlas
+
+gi.require_version('Gtk', '4.0')
+gi.require_version('Graphene', '1.0')
+
+from gi.repository import Gtk, Graphene  # noqa
+
+
+class EmojiImage(Gtk.Widget):
+    """Draws one emoji by clipping a page of an EmojiAtlas, no text shaping nor rasterization involved"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.atlas: EmojiAtlas = None
+        self.slot = None
+
+    def set_emoji(self, atlas: EmojiAtlas, slot: int):
+        resize = (self.atlas is None) or (self.atlas.cell_size != atlas.cell_size) or (self.atlas.scale != atlas.scale)
+
+        self.atlas = atlas
+        self.slot = slot
+
+        if resize:
+            self.queue_resize()
+        else:
+            self.queue_draw()
+
+    def do_measure(self, orientation: Gtk.Orientation, for_size: int) -> tuple[int, int, int, int]:
+        size = (self.atlas.cell_size // self.atlas.scale) if self.atlas else 0
+        return (size, size, -1, -1)
+
+    def do_snapshot(self, snapshot: Gtk.Snapshot):
+        if not self.atlas:
+            return
+
+        size = self.atlas.cell_size / self.atlas.scale
+        x = (self.get_width() - size) / 2
+        y = (self.get_height() - size) / 2
+        cell_x, cell_y = self.atlas.get_cell_position(self.slot)
+
+        texture = self.atlas.get_texture(self.atlas.get_page(self.slot))
+        texture_rect = Graphene.Rect().init(
+            x - (cell_x / self.atlas.scale),
+            y - (cell_y / self.atlas.scale),
+            texture.get_width() / self.atlas.scale,
+            texture.get_height() / self.atlas.scale
+        )
+
+        snapshot.push_clip(Graphene.Rect().init(x, y, size, size))
+        snapshot.append_texture(texture, texture_rect)
+        snapshot.pop()
@@ -0,0 +1,57 @@
+import gi
+from typing import Optional
+from ..lib.skintones import get_skintone_variant
+
+from gi.repository import GObject  # noqa
+
+
+class EmojiObject(GObject.Object):
+    """An emoji in the list model of the grid.
+
+    The selection state is kept here and not in the widgets,
+    because the widgets are recycled to show other emojis while scrolling.
+    """
+
+    def __init__(self, emoji_data: dict, base_item: Optional['EmojiObject'] = None):
+        super().__init__()
+        self.emoji_data = emoji_data
+        self.hexcode = emoji_data['hexcode']
+        self.label = emoji_data['emoji']
+
+        # For the skintone variants, the item of the emoji they belong to
+        self.base_item = base_item
+
+        self.is_selected = False
+        self.is_active = False
+
+        # The widgets showing this item: the grids of the stack pages stay bound while hidden,
+        # so the same item can be shown by a cell of each of them
+        self.cells = set()
+
+    def set_skintone(self, modifier: str):
+        variant = get_skintone_variant(self.hexcode, modifier)
+        self.label = variant['emoji'] if variant else self.emoji_data['emoji']
+
+    def set_as_selected(self):
+        self.is_selected = True
+        self.is_active = False
+        self.update_cells()
+
+    def set_as_active(self):
+        self.is_active = True
+        self.update_cells()
+
+    def deselect(self):
+        self.is_selected = False
+        self.is_active = False
+        self.update_cells()
+
+    def add_cell(self, cell):
+        self.cells.add(cell)
+
+    def remove_cell(self, cell):
+        self.cells.discard(cell)
+
+    def update_cells(self):
+        for cell in self.cells:
+            cell.update_state()
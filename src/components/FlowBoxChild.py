@@ -15,15 +15,17 @@ class FlowBoxChild(Gtk.FlowBoxChild):
         self.emoji_button = emoji_button
         self.emoji_button.set_can_focus(False)
 
-        self._is_selected = False
+        self.item = emoji_button.item
+        self.item.add_cell(self)
+
         self.event_controller_focus = Gtk.EventControllerFocus()
 
         self.default_css = ['flowbox-child-custom']
         if ('skintones' in emoji_button.emoji_data) and emoji_button.emoji_data['skintones']:
             self.default_css.append('emoji-with-skintones')
 
-        self.set_css_classes(self.default_css)
-        
+        self.update_state()
+
         self.event_controller_focus.connect('enter', lambda x: self.set_css_classes(self.default_css))
         self.event_controller_focus.connect('leave', self.on_selection_leave)
         self.add_controller(self.event_controller_focus)
@@ -31,18 +33,13 @@ class FlowBoxChild(Gtk.FlowBoxChild):
         self.set_child(emoji_button)
 
     def on_selection_leave(self, event):
-        if self._is_selected:
-            self.set_as_selected()
+        self.item.is_active = False
+        self.update_state()
+
+    def update_state(self):
+        if self.item.is_active:
+            self.set_css_classes([*self.default_css, 'active'])
+        elif self.item.is_selected:
+            self.set_css_classes([*self.default_css, 'selected'])
         else:
-            self.deselect()
-
-    def set_as_selected(self):
-        self._is_selected = True
-        self.set_css_classes([*self.default_css, 'selected'])
-
-    def set_as_active(self):
-        self.set_css_classes([*self.default_css, 'active'])
-
-    def deselect(self):
-        self._is_selected = False
-        self.set_css_classes([*self.default_css])
+            self.set_css_classes(self.default_css)
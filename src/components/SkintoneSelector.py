@@ -1,10 +1,12 @@
 import gi
-from ..assets.emoji_list import emojis
 from ..lib.custom_tags import set_custom_tags, get_custom_tags
 from ..lib.localized_tags import get_localized_tags, get_countries_list
 from .CustomPopover import CustomPopover
 from .EmojiButton import EmojiButton
+from .EmojiObject import EmojiObject
 from .FlowBoxChild import FlowBoxChild
+from ..lib.app_settings import get_settings_snapshot
+from ..lib.skintones import get_skintones
 
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
@@ -13,10 +15,10 @@ from gi.repository import Gtk, Gio, Gdk, GLib, Adw  # noqa
 
 
 class SkintoneSelector(CustomPopover):
-    def __init__(self, flowbox_child: Gtk.FlowBoxChild, parent: Gtk.Window, click_handler: callable, keypress_handler: callable, emoji_active_selection: list[EmojiButton]):
+    def __init__(self, item: EmojiObject, parent: Gtk.Window, click_handler: callable, keypress_handler: callable, emoji_active_selection: list[EmojiObject]):
         super().__init__(parent=parent)
         self.click_handler = click_handler
-        self.flowbox_child = flowbox_child
+        self.item = item
 
         popover_content = Gtk.Box(
             orientation=Gtk.Orientation.VERTICAL,
@@ -28,6 +30,7 @@ class SkintoneSelector(CustomPopover):
         )
 
         skintone_emojis = Gtk.FlowBox(
+            css_classes=[get_settings_snapshot().get_string('emoji-size-class')],
             orientation=Gtk.Orientation.HORIZONTAL,
             max_children_per_line=100,
             min_children_per_line=100,
@@ -49,19 +52,20 @@ class SkintoneSelector(CustomPopover):
         popover_container.set_propagate_natural_width(True)
         popover_container.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.NEVER)
 
-        relative_widget_hexcode = flowbox_child.emoji_button.emoji_data['hexcode']
-        for skintone in emojis[relative_widget_hexcode]['skintones']:
-            button = EmojiButton(skintone, width_request=55)
-            button.base_skintone_widget = flowbox_child
-            button.connect('clicked', self.handle_activate)
-
-            child = FlowBoxChild(emoji_button=button)
+        for skintone in get_skintones(item.hexcode):
+            skintone_item = EmojiObject(skintone, base_item=item)
 
             for e in emoji_active_selection:
-                if e.hexcode == button.emoji_data['hexcode']:
-                    child.set_as_selected()
+                if e.hexcode == skintone_item.hexcode:
+                    skintone_item.is_selected = True
                     break
 
+            button = EmojiButton(width_request=55)
+            button.bind(skintone_item)
+            button.connect('clicked', self.handle_activate)
+
+            child = FlowBoxChild(emoji_button=button)
+
             skintone_emojis.append(child)
 
         popover_container.set_child(skintone_emojis)
@@ -85,13 +89,8 @@ class SkintoneSelector(CustomPopover):
         self.click_handler(_)
         return True
 
-    def check_skintone(flowbox_child):
-        relative_widget_hexcode = flowbox_child.emoji_button.emoji_data['hexcode']
-        if ('skintones' in emojis[relative_widget_hexcode]):
-            for skintone in emojis[relative_widget_hexcode]['skintones']:
-                return True
-
-        return False
+    def check_skintone(item: EmojiObject):
+        return bool(get_skintones(item.hexcode))
 
     def on_close(self):
         pass
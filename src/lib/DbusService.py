@@ -1,6 +1,5 @@
 import gi
 from typing import Optional
-from ..utils import portal
 
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
@@ -31,8 +30,17 @@ class DbusService():
         self.node = Gio.DBusNodeInfo.new_for_xml(DBUS_NODE_XML)
 
         try:
-            inter = portal('org.gnome.Shell.Extensions', 'org.gnome.Shell.Extensions', '/org/gnome/Shell/Extensions')
-            installed_extensions = [str(k) for k in inter.ListExtensions().keys()]
+            proxy = Gio.DBusProxy.new_for_bus_sync(
+                Gio.BusType.SESSION,
+                Gio.DBusProxyFlags.DO_NOT_LOAD_PROPERTIES | Gio.DBusProxyFlags.DO_NOT_CONNECT_SIGNALS,
+                None,
+                'org.gnome.Shell.Extensions',
+                '/org/gnome/Shell/Extensions',
+                'org.gnome.Shell.Extensions',
+                None,
+            )
+
+            installed_extensions = list(proxy.call_sync('ListExtensions', None, Gio.DBusCallFlags.NONE, -1, None).unpack()[0].keys())
             DbusService.extension_status = 'installed' if GNOME_EXTENSION_UUID in installed_extensions else 'not_installed'
         except Exception as e:
             DbusService.extension_status = 'unavailable'
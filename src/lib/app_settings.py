@@ -0,0 +1,56 @@
+from gi.repository import Gio
+
+SCHEMA_ID = 'it.mijorus.smile'
+
+class SettingsSnapshot():
+    """The Gio.Settings of the app, with every value cached after the first read.
+
+    A cached value is dropped as soon as its key changes, so reading a setting
+    in a hot path is a dictionary lookup instead of a call into GSettings.
+    """
+
+    def __init__(self):
+        self.settings = Gio.Settings.new(SCHEMA_ID)
+        self.values = {}
+
+        # connected before anyone else, so the cache is already clean when the other handlers run
+        self.settings.connect('changed', self.on_changed)
+
+    def on_changed(self, settings: Gio.Settings, key: str):
+        self.values.pop(key, None)
+
+    def get(self, key: str):
+        if not key in self.values:
+            self.values[key] = self.settings.get_value(key).unpack()
+
+        return self.values[key]
+
+    def get_boolean(self, key: str) -> bool:
+        return self.get(key)
+
+    def get_string(self, key: str) -> str:
+        return self.get(key)
+
+    def get_strv(self, key: str) -> list[str]:
+        return self.get(key)
+
+    def set_boolean(self, key: str, value: bool):
+        self.settings.set_boolean(key, value)
+
+    def set_string(self, key: str, value: str):
+        self.settings.set_string(key, value)
+
+    def connect(self, signal: str, callback: callable, *args) -> int:
+        return self.settings.connect(signal, callback, *args)
+
+
+settings_snapshot: SettingsSnapshot = None
+
+def get_settings_snapshot() -> SettingsSnapshot:
+    """The settings shared by the whole app"""
+    global settings_snapshot
+
+    if settings_snapshot is None:
+        settings_snapshot = SettingsSnapshot()
+
+    return settings_snapshot
@@ -1,11 +1,15 @@
 from gi.repository import GLib
 from .user_config import save_json_config, read_json_config
 
+# None until loaded: an empty dict is what users without custom tags have
 custom_tags_config = None
 
+# Bumped every time the custom tags change, so that search results depending on them can be discarded
+custom_tags_version = 0
+
 def set_custom_tags(hexcode: str, tags: str):
     """Saves the new tags for a given emoji in a configuration file"""
-    global custom_tags_config
+    global custom_tags_config, custom_tags_version
 
     current_conf = read_json_config('custom_tags')
 
@@ -22,23 +26,50 @@ def set_custom_tags(hexcode: str, tags: str):
 
     res = save_json_config(current_conf, 'custom_tags')
     custom_tags_config = current_conf
+    custom_tags_version += 1
 
-def get_custom_tags(hexcode: str, cache=False) -> str:
-    global custom_tags_config
+def load_custom_tags_config():
+    """Reads the configuration file, the version only changes if its content did"""
+    global custom_tags_config, custom_tags_version
+
+    conf = read_json_config('custom_tags') or {}
 
-    if (not cache) or (not custom_tags_config):
-        custom_tags_config = read_json_config('custom_tags')
+    if conf != custom_tags_config:
+        custom_tags_config = conf
+        custom_tags_version += 1
+
+def get_custom_tags(hexcode: str, cache=False) -> str:
+    if (not cache) or (custom_tags_config is None):
+        load_custom_tags_config()
         
     if (hexcode in custom_tags_config) and custom_tags_config[hexcode]['tags']:
         return custom_tags_config[hexcode]['tags']
     
     return ''
 
+def get_custom_tags_config() -> dict:
+    """Returns the cached custom tags configuration, loading it the first time"""
+    if custom_tags_config is None:
+        load_custom_tags_config()
+
+    return custom_tags_config
+
+def get_custom_tags_version() -> int:
+    return custom_tags_version
+
+def replace_custom_tags(conf: dict):
+    """Saves a whole configuration, as when restoring a backup"""
+    global custom_tags_config, custom_tags_version
+
+    save_json_config(conf, 'custom_tags')
+    custom_tags_config = conf
+    custom_tags_version += 1
+
 def get_all_custom_tags() -> dict:
     return read_json_config('custom_tags')
 
 def delete_custom_tags(hexcode: str) -> dict:
-    global custom_tags_config
+    global custom_tags_config, custom_tags_version
 
     conf = read_json_config('custom_tags')
 
@@ -47,5 +78,6 @@ def delete_custom_tags(hexcode: str) -> dict:
 
     save_json_config(conf, 'custom_tags')
     custom_tags_config = conf
+    custom_tags_version += 1
 
     return True
\ No newline at end of file
@@ -0,0 +1,231 @@
+import gi
+import os
+import json
+import math
+import struct
+import hashlib
+import threading
+from typing import Optional
+from .emoji_data import emojis
+from ..utils import idle
+
+gi.require_version('Gdk', '4.0')
+gi.require_version('Pango', '1.0')
+gi.require_version('PangoCairo', '1.0')
+
+from gi.repository import Gdk, GLib, Pango, PangoCairo  # noqa
+
+# Font size, in pixels, of every emoji-size-class (see style.css)
+SIZE_CLASSES = {
+    'emoji-button': 20,
+    'emoji-button-lg': 22,
+    'emoji-button-xl': 25,
+    'emoji-button-xxl': 28,
+}
+
+# Largest width and height of a page of the atlas, in pixels: each page is a texture of its own,
+# decoded the first time one of its emojis is drawn
+ATLAS_PAGE_SIZE = 1024
+ATLAS_FONT_FAMILY = 'Noto Color Emoji'
+ATLAS_CACHE_VERSION = 2
+
+def get_page_columns(cell_size: int) -> int:
+    return max(1, ATLAS_PAGE_SIZE // cell_size)
+
+class EmojiAtlas():
+    """Every emoji rasterized once, side by side in a few textures.
+
+    Each glyph sits in a square cell of cell_size pixels (at the given scale),
+    in the order of the data, so the first page holds the emojis shown when the window opens;
+    the widgets draw a glyph by clipping the texture of its page to its cell.
+    """
+
+    def __init__(self, page_paths: list[str], labels: list[str], cell_size: int, scale: int):
+        self.page_paths = page_paths
+        self.pages: dict[int, Gdk.Texture] = {}
+        self.slots = {label: i for i, label in enumerate(labels)}
+        self.cell_size = cell_size
+        self.scale = scale
+        self.columns = get_page_columns(cell_size)
+
+    def get_slot(self, label: str) -> Optional[int]:
+        return self.slots.get(label)
+
+    def get_page(self, slot: int) -> int:
+        return slot // (self.columns * self.columns)
+
+    def get_texture(self, page: int) -> Gdk.Texture:
+        if not page in self.pages:
+            self.pages[page] = Gdk.Texture.new_from_filename(self.page_paths[page])
+
+        return self.pages[page]
+
+    def get_cell_position(self, slot: int) -> tuple[int, int]:
+        """The top-left corner of a cell in the texture of its page, in texture pixels"""
+        slot = slot % (self.columns * self.columns)
+        return ((slot % self.columns) * self.cell_size, (slot // self.columns) * self.cell_size)
+
+
+emoji_atlas: Optional[EmojiAtlas] = None
+
+# Increased by every load_emoji_atlas call, so that an atlas built for older settings is dropped
+atlas_generation = 0
+
+def get_emoji_atlas() -> Optional[EmojiAtlas]:
+    return emoji_atlas
+
+def get_atlas_labels() -> list[str]:
+    """Every string the grid can show: the emojis and all their skintone variants"""
+    labels = []
+    for emoji in emojis.values():
+        labels.append(emoji['emoji'])
+
+        for tone in emoji.get('skintones', []):
+            labels.append(tone['emoji'])
+
+    return labels
+
+def get_font_fingerprint(font_path: str) -> str:
+    """Identifies the font file by its size and its table directory, which holds a checksum of every table.
+
+    The modification time is not used: Flatpak sets it to 0 for every file.
+    """
+    try:
+        with open(font_path, 'rb') as f:
+            header = f.read(12)
+            num_tables, = struct.unpack_from('>H', header, 4)
+            table_directory = f.read(num_tables * 16)
+
+        digest = hashlib.sha1(header + table_directory).hexdigest()
+        return f'{font_path}:{os.path.getsize(font_path)}:{digest}'
+    except (OSError, struct.error):
+        # the font is not bundled, the glyphs come from the system
+        return f'{ATLAS_FONT_FAMILY}:{Pango.version_string()}'
+
+def get_atlas_cache_path(size_class: str, scale: int, font_path: str) -> str:
+    # the emoji data is part of the key, an atlas missing the new emojis must not be reused
+    key = f'{ATLAS_CACHE_VERSION}:{get_font_fingerprint(font_path)}:{emojis.get_digest()}:{size_class}:{scale}'
+    key_hash = hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    return f'{GLib.get_user_cache_dir()}/emoji_atlas/{size_class}-{scale}x-{key_hash}'
+
+def render_atlas(labels: list[str], font_size: int, scale: int, cell_size: int, page_paths: list[str]):
+    import cairo
+
+    columns = get_page_columns(cell_size)
+    per_page = columns * columns
+
+    font_desc = Pango.FontDescription.new()
+    font_desc.set_family(ATLAS_FONT_FAMILY)
+    font_desc.set_absolute_size(font_size * scale * Pango.SCALE)
+
+    for page, page_path in enumerate(page_paths):
+        page_labels = labels[page * per_page:(page + 1) * per_page]
+        rows = math.ceil(len(page_labels) / columns)
+
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, columns * cell_size, rows * cell_size)
+        cr = cairo.Context(surface)
+
+        layout = PangoCairo.create_layout(cr)
+        layout.set_font_description(font_desc)
+
+        for i, label in enumerate(page_labels):
+            layout.set_text(label, -1)
+            ink_rect, logical_rect = layout.get_pixel_extents()
+
+            x = (i % columns) * cell_size + (cell_size - logical_rect.width) / 2
+            y = (i // columns) * cell_size + (cell_size - logical_rect.height) / 2
+
+            cr.move_to(x, y)
+            PangoCairo.show_layout(cr, layout)
+
+        surface.write_to_png(page_path)
+
+def get_atlas_geometry(size_class: str, scale: int) -> tuple[int, int]:
+    """The font size and the cell size, in pixels at the given scale"""
+    font_size = SIZE_CLASSES.get(size_class, SIZE_CLASSES['emoji-button'])
+    return (font_size, math.ceil(font_size * 1.4) * scale)
+
+def get_page_paths(cache_path: str, labels: list[str], cell_size: int) -> list[str]:
+    per_page = get_page_columns(cell_size) ** 2
+    return [f'{cache_path}-{page}.png' for page in range(math.ceil(len(labels) / per_page))]
+
+def open_emoji_atlas(size_class: str, scale: int, font_path: str) -> Optional[EmojiAtlas]:
+    """Opens the atlas saved in the cache, without rendering nor decoding anything; None if it is missing"""
+    cache_path = get_atlas_cache_path(size_class, scale, font_path)
+    font_size, cell_size = get_atlas_geometry(size_class, scale)
+
+    try:
+        with open(f'{cache_path}.json', 'r') as f:
+            labels = json.load(f)['labels']
+    except (OSError, ValueError, KeyError):
+        return None
+
+    page_paths = get_page_paths(cache_path, labels, cell_size)
+    if not all(os.path.exists(p) for p in page_paths):
+        return None
+
+    return EmojiAtlas(page_paths, labels, cell_size, scale)
+
+def build_emoji_atlas(size_class: str, scale: int, font_path: str) -> EmojiAtlas:
+    """Renders the atlas and saves it in the cache"""
+    cache_path = get_atlas_cache_path(size_class, scale, font_path)
+    font_size, cell_size = get_atlas_geometry(size_class, scale)
+
+    labels = get_atlas_labels()
+    page_paths = get_page_paths(cache_path, labels, cell_size)
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    render_atlas(labels, font_size, scale, cell_size, page_paths)
+
+    # the index is written last, a partial atlas is never considered valid
+    with open(f'{cache_path}.json', 'w') as f:
+        json.dump({'cell_size': cell_size, 'labels': labels}, f)
+
+    atlas = EmojiAtlas(page_paths, labels, cell_size, scale)
+
+    # decode the first page here, instead of in the first frame using it
+    atlas.get_texture(0)
+    return atlas
+
+def load_emoji_atlas(size_class: str, scale: int, font_path: str, callback: callable):
+    """Makes the atlas active and runs callback on the main loop.
+
+    An atlas already in the cache is opened right away, so the emojis are never shaped nor rasterized;
+    otherwise it is rendered in a thread, and the emojis are drawn as text in the meantime.
+    """
+    global atlas_generation, emoji_atlas
+
+    atlas_generation += 1
+    generation = atlas_generation
+
+    atlas = open_emoji_atlas(size_class, scale, font_path)
+    if atlas:
+        emoji_atlas = atlas
+        callback()
+        return
+
+    def run():
+        try:
+            atlas = build_emoji_atlas(size_class, scale, font_path)
+        except Exception as e:
+            print(e)
+            return
+
+        set_emoji_atlas(generation, atlas, callback)
+
+    threading.Thread(target=run, daemon=True, name='smile-atlas').start()
+
+@idle
+def set_emoji_atlas(generation: int, atlas: EmojiAtlas, callback: callable):
+    global emoji_atlas
+
+    if generation == atlas_generation:
+        emoji_atlas = atlas
+        callback()
+
+def unload_emoji_atlas():
+    global emoji_atlas, atlas_generation
+
+    atlas_generation += 1
+    emoji_atlas = None
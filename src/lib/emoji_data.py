@@ -0,0 +1,209 @@
+import os
+import mmap
+import hashlib
+import struct
+from collections.abc import Mapping
+from typing import Optional
+
+# The emoji data, generated by precompile/emoji_list/generate_emoji_dict.py;
+# the layout written there must match the one read here.
+#
+# header | records | hexcode index | categories | string pool
+#
+# Records have a fixed width: the emojis come first, in the order of the data,
+# followed by all the skintone variants, so the ones of an emoji are a contiguous range.
+# Strings are (offset, length) pairs into the UTF-8 pool.
+TABLE_PATH = os.path.dirname(os.path.abspath(__file__)) + '/../assets/emoji_list.bin'
+
+TABLE_MAGIC = b'SMIL'
+TABLE_VERSION = 1
+
+# magic, version, n. of emojis, n. of records (emojis + skintones), n. of categories,
+# offset of the records, of the index, of the categories and of the string pool
+HEADER = struct.Struct('<4sHIIIIIII')
+
+# emoji, hexcode, tags (offset and length of each), order, first skintone record, n. of skintones, category
+RECORD = struct.Struct('<IHIHIHIIHH')
+
+# the record numbers of the emojis, sorted by hexcode
+INDEX_ENTRY = struct.Struct('<I')
+
+# name, icon (offset and length of each)
+CATEGORY = struct.Struct('<IHIH')
+
+
+class EmojiRecord(Mapping):
+    """A read-only view of one record of the table, with the same keys as the old emoji dicts.
+
+    Only the numbers of the record are unpacked, the strings are decoded when first accessed;
+    "skintones" is only a key of the emojis that have some, as before.
+    """
+
+    __slots__ = ('table', 'fields', 'values')
+
+    KEYS = ('emoji', 'hexcode', 'group', 'tags', 'order')
+
+    def __init__(self, table: 'EmojiTable', fields: tuple):
+        self.table = table
+        self.fields = fields
+        self.values = {}
+
+    def __getitem__(self, key: str):
+        if key in self.values:
+            return self.values[key]
+
+        f = self.fields
+
+        if key == 'emoji':
+            value = self.table.get_string(f[0], f[1])
+        elif key == 'hexcode':
+            value = self.table.get_string(f[2], f[3])
+        elif key == 'tags':
+            value = self.table.get_string(f[4], f[5])
+        elif key == 'order':
+            return f[6]
+        elif key == 'group':
+            return self.table.category_names[f[9]]
+        elif key == 'skintones' and f[8]:
+            value = self.table.get_records(f[7], f[8])
+        else:
+            raise KeyError(key)
+
+        self.values[key] = value
+        return value
+
+    def __contains__(self, key) -> bool:
+        return (key in self.KEYS) or (key == 'skintones' and self.fields[8] > 0)
+
+    def __iter__(self):
+        yield from self.KEYS
+
+        if self.fields[8]:
+            yield 'skintones'
+
+    def __len__(self) -> int:
+        return len(self.KEYS) + (1 if self.fields[8] else 0)
+
+    def __repr__(self) -> str:
+        return f'EmojiRecord({self["hexcode"]})'
+
+
+class EmojiTable(Mapping):
+    """hexcode -> EmojiRecord, reading the memory-mapped table.
+
+    Iterates in the order of the data like the old dict; lookups are a binary search on the index,
+    nothing is decoded until a record is accessed. Records and lookups are memoized,
+    so the emojis shown again and again cost a dict lookup.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.digest = None
+
+        self.records: list[Optional[EmojiRecord]] = []
+        self.numbers: dict[str, int] = {}
+
+        magic, version, self.n_emojis, self.n_records, n_categories, \
+            self.records_offset, self.index_offset, categories_offset, self.pool_offset = HEADER.unpack_from(self.buffer, 0)
+
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise ValueError(f'{path} is not a supported emoji table')
+
+        self.categories = {}
+        for i in range(n_categories):
+            name_offset, name_length, icon_offset, icon_length = CATEGORY.unpack_from(self.buffer, categories_offset + i * CATEGORY.size)
+            self.categories[self.get_string(name_offset, name_length)] = {'icon': self.get_string(icon_offset, icon_length)}
+
+        self.category_names = list(self.categories)
+        self.records = [None] * self.n_records
+
+    def get_digest(self) -> str:
+        """A hash of the whole table, for the caches built from the data"""
+        if self.digest is None:
+            self.digest = hashlib.sha1(self.buffer).hexdigest()
+
+        return self.digest
+
+    def get_string(self, offset: int, length: int) -> str:
+        start = self.pool_offset + offset
+        return self.buffer[start:start + length].decode('utf-8')
+
+    def get_record(self, n: int) -> EmojiRecord:
+        record = self.records[n]
+
+        if record is None:
+            record = EmojiRecord(self, RECORD.unpack_from(self.buffer, self.records_offset + n * RECORD.size))
+            self.records[n] = record
+
+        return record
+
+    def get_records(self, start: int, count: int) -> list[EmojiRecord]:
+        return [self.get_record(n) for n in range(start, start + count)]
+
+    def get_hexcode_bytes(self, n: int) -> bytes:
+        offset, length = struct.unpack_from('<IH', self.buffer, self.records_offset + n * RECORD.size + 6)
+        start = self.pool_offset + offset
+        return self.buffer[start:start + length]
+
+    def find(self, hexcode: str) -> Optional[int]:
+        """The record number of an emoji (skintones are not indexed)"""
+        if not isinstance(hexcode, str):
+            return None
+
+        if hexcode in self.numbers:
+            return self.numbers[hexcode]
+
+        key = hexcode.encode('utf-8')
+        low, high = 0, self.n_emojis
+
+        while low < high:
+            middle = (low + high) // 2
+            n, = INDEX_ENTRY.unpack_from(self.buffer, self.index_offset + middle * INDEX_ENTRY.size)
+            value = self.get_hexcode_bytes(n)
+
+            if value == key:
+                self.numbers[hexcode] = n
+                return n
+            elif value < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return None
+
+    def __getitem__(self, hexcode: str) -> EmojiRecord:
+        n = self.find(hexcode)
+
+        if n is None:
+            raise KeyError(hexcode)
+
+        return self.get_record(n)
+
+    def __contains__(self, hexcode) -> bool:
+        return self.find(hexcode) is not None
+
+    def __iter__(self):
+        for n in range(self.n_emojis):
+            hexcode = self.get_hexcode_bytes(n).decode('utf-8')
+            self.numbers[hexcode] = n
+            yield hexcode
+
+    def __len__(self) -> int:
+        return self.n_emojis
+
+    def values(self) -> list[EmojiRecord]:
+        # sequential reads, instead of a lookup for every key
+        return self.get_records(0, self.n_emojis)
+
+    def items(self) -> list[tuple[str, EmojiRecord]]:
+        items = [(record['hexcode'], record) for record in self.values()]
+
+        # whoever goes through all the emojis fills the lookups too, the search index does it first
+        self.numbers.update((hexcode, n) for n, (hexcode, record) in enumerate(items))
+        return items
+
+
+emojis = EmojiTable(TABLE_PATH)
+emoji_categories = emojis.categories
@@ -0,0 +1,105 @@
+def _deletes(word: str, max_distance: int) -> set:
+    """Every string obtained by removing up to max_distance characters from word"""
+    result = {word}
+    frontier = {word}
+
+    for i in range(max_distance):
+        frontier = {w[:j] + w[j + 1:] for w in frontier for j in range(len(w))}
+        result.update(frontier)
+
+    return result
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance between a and b (an adjacent transposition counts as one edit).
+
+    Only the diagonal band of width max_distance is computed, and the function gives up
+    as soon as the distance is known to be higher than max_distance, returning max_distance + 1.
+    """
+    len_a = len(a)
+    len_b = len(b)
+    too_far = max_distance + 1
+
+    if abs(len_a - len_b) > max_distance:
+        return too_far
+
+    prev2 = None
+    prev = list(range(len_b + 1))
+
+    for i in range(1, len_a + 1):
+        cur = [too_far] * (len_b + 1)
+        cur[0] = i
+        row_min = i if i <= max_distance else too_far
+        char_a = a[i - 1]
+
+        for j in range(max(1, i - max_distance), min(len_b, i + max_distance) + 1):
+            char_b = b[j - 1]
+            value = prev[j - 1] if char_a == char_b else prev[j - 1] + 1
+
+            if prev[j] + 1 < value:
+                value = prev[j] + 1
+
+            if cur[j - 1] + 1 < value:
+                value = cur[j - 1] + 1
+
+            if (i > 1) and (j > 1) and (char_a == b[j - 2]) and (a[i - 2] == char_b) and (prev2[j - 2] + 1 < value):
+                value = prev2[j - 2] + 1
+
+            cur[j] = value
+            if value < row_min:
+                row_min = value
+
+        if row_min > max_distance:
+            return too_far
+
+        prev2, prev = prev, cur
+
+    return prev[len_b] if prev[len_b] <= max_distance else too_far
+
+
+class FuzzyIndex():
+    """Deletion dictionary (as in SymSpell) over a vocabulary of words.
+
+    Every word is stored under all the strings obtained by deleting up to
+    MAX_DISTANCE characters from its first PREFIX_LENGTH characters.
+    A lookup generates the same deletes for the query, collects the words
+    that share at least one of them and only computes the edit distance
+    for those few candidates.
+    """
+
+    MAX_DISTANCE = 2
+    PREFIX_LENGTH = 7
+
+    def __init__(self, words: dict):
+        self.words = words
+        self.deletes = {}
+
+        for word in words:
+            for d in _deletes(word[:self.PREFIX_LENGTH], self.MAX_DISTANCE):
+                if not d in self.deletes:
+                    self.deletes[d] = []
+
+                self.deletes[d].append(word)
+
+    def lookup(self, query: str, max_distance: int) -> dict:
+        """Returns {hexcode: distance} for every word within max_distance edits from the query"""
+        max_distance = min(max_distance, self.MAX_DISTANCE)
+        checked = set()
+        result = {}
+
+        for d in _deletes(query[:self.PREFIX_LENGTH], max_distance):
+            for word in self.deletes.get(d, ()):
+                if word in checked:
+                    continue
+
+                checked.add(word)
+                distance = edit_distance(query, word, max_distance)
+
+                if distance > max_distance:
+                    continue
+
+                for hexcode in self.words[word]:
+                    if (not hexcode in result) or (result[hexcode] > distance):
+                        result[hexcode] = distance
+
+        return result
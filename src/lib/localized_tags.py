@@ -1,17 +1,34 @@
 import json
 
-_active_localized_tags = {'lang': None, 'data': {}}
+# Parsed locale files, each one is loaded only once
+_localized_tags: dict = {}
 
-def get_localized_tags(lang: str, emoji_hexcode: str, datadir: str) -> list:
-    global _active_localized_tags
-    if _active_localized_tags['lang'] != lang:
+def get_tags_locales(settings) -> list:
+    """Returns the locales whose tags should be searched, 
+    falling back to the single tags-locale key used by older versions"""
+    locales = [l for l in settings.get_strv('tags-locales') if l != 'en']
+
+    if not locales:
+        legacy_locale = settings.get_string('tags-locale')
+        if legacy_locale != 'en':
+            locales = [legacy_locale]
+
+    return locales
+
+def get_localized_tags_data(lang: str, datadir: str) -> dict:
+    if not lang in _localized_tags:
         with open(file=datadir + f'/assets/emoji_locales/{lang}.json', mode='r') as f:
-            _active_localized_tags = {'lang': lang, 'data': json.load(f)}
+            _localized_tags[lang] = json.load(f)
+
+    return _localized_tags[lang]
+
+def get_localized_tags(lang: str, emoji_hexcode: str, datadir: str) -> list:
+    data = get_localized_tags_data(lang, datadir)
 
-    if not emoji_hexcode in _active_localized_tags['data']:
+    if not emoji_hexcode in data:
         return []
 
-    return _active_localized_tags['data'][emoji_hexcode]['tags']
+    return data[emoji_hexcode]['tags']
 
 def get_countries_list() -> dict:
         return {
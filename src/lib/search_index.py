@@ -0,0 +1,555 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import OrderedDict
+from .fuzzy_index import FuzzyIndex
+from .custom_tags import get_custom_tags_config, get_custom_tags_version
+from .localized_tags import get_localized_tags_data
+
+
+def split_tags(tags: str) -> list:
+    """Splits a comma separated list of tags, the same way they are stored in the emoji list"""
+    return tags.replace(', ', ',').split(',')
+
+
+def normalize_hexcode(text: str) -> str:
+    """Turns "U+1F44D U+1F3FB", "1f44d-1f3fb" or "1F44D_FE0F" into the "1F44D-1F3FB" / "1F44D" form,
+    without variation selectors. Returns None if the text is not a sequence of codepoints."""
+    parts = [p for p in re.split(r'[\s,_+-]+', text.upper().replace('U+', ' ')) if p]
+
+    try:
+        codepoints = [int(p, 16) for p in parts]
+    except ValueError:
+        return None
+
+    return '-'.join(format(c, '04X') for c in codepoints if c != 0xFE0F) or None
+
+
+def fold_case(text: str) -> str:
+    return text.casefold()
+
+
+def fold_accents(text: str) -> str:
+    """Case-folds the text and strips its diacritics, so that "Café" becomes "cafe".
+
+    Kana voicing marks are kept, as they make a different letter rather than an accent.
+    """
+    return ''.join(
+        c for c in unicodedata.normalize('NFKD', text.casefold())
+        if (not unicodedata.combining(c)) or (c in '\u3099\u309a')
+    )
+
+
+# Shorter words and queries are not matched with typos, as almost everything would be a match
+FUZZY_MIN_LENGTH = 3
+
+# Relevance scores: every match gets one number before any widget is created,
+# results are then shown from the highest score to the lowest
+SCORE_EMOJI = 1000          # the query is the emoji itself
+SCORE_EXACT = 300           # a tag is equal to the query
+SCORE_PREFIX = 200          # a tag starts with the query
+SCORE_ALL_WORDS = 160       # every word of the query starts a word in the tags
+SCORE_SUBSTRING = 120       # a tag contains the query, only for locales written without spaces
+SCORE_FUZZY = 60            # a word of a tag is a few typos away, minus SCORE_FUZZY_EDIT for each edit
+SCORE_FUZZY_EDIT = 20
+MAX_SCORE_USAGE = 50        # bonus for each time the emoji was used, up to this value
+
+# Bonus for matches on a custom tag: a custom prefix match always ranks above
+# a frequently used exact match of the other tags
+SCORE_CUSTOM_TAG = SCORE_EXACT - SCORE_PREFIX + MAX_SCORE_USAGE + 1
+
+
+class PrefixTable():
+    """A sorted table of lowercase tags, each one pointing to the hexcodes that own it.
+
+    Looking up a prefix is a binary search followed by a walk over the matching keys,
+    so the cost depends on the number of matches and not on the size of the table.
+    """
+
+    def __init__(self, entries: dict):
+        self.keys = sorted(entries.keys())
+        self.values = [entries[k] for k in self.keys]
+
+    def lookup(self, prefix: str):
+        i = bisect_left(self.keys, prefix)
+        keys_len = len(self.keys)
+
+        while (i < keys_len) and self.keys[i].startswith(prefix):
+            yield self.keys[i], self.values[i]
+            i += 1
+
+
+# Locales whose tags are not split into words, so they are also searched by substring
+SUBSTRING_LOCALES = ['ja']
+
+
+class NgramIndex():
+    """Maps every character and every pair of adjacent characters to the tags containing them.
+
+    A substring query intersects the sets of its bigrams, starting from the smallest one,
+    and only checks the few tags left, instead of scanning all of them.
+    """
+
+    def __init__(self, tags):
+        self.grams = {}
+
+        for tag in tags:
+            for gram in {*tag, *self.bigrams(tag)}:
+                if not gram in self.grams:
+                    self.grams[gram] = set()
+
+                self.grams[gram].add(tag)
+
+    def bigrams(self, text: str) -> set:
+        return {text[i:i + 2] for i in range(len(text) - 1)}
+
+    def lookup(self, query: str) -> set:
+        grams = self.bigrams(query) if len(query) > 1 else {query}
+        postings = sorted((self.grams.get(g, set()) for g in grams), key=len)
+
+        if not postings:
+            return set()
+
+        candidates = set(postings[0])
+        for p in postings[1:]:
+            candidates.intersection_update(p)
+
+            if not candidates:
+                break
+
+        return {tag for tag in candidates if query in tag}
+
+
+class TagIndex():
+    """Prefix index over a {hexcode: [tag, ...]} mapping.
+
+    Tags are folded once, when the index is built: queries must be folded
+    with the same function before being looked up. The tags listed in substring_tags
+    are matched anywhere they contain the query, the others only by prefix.
+    """
+
+    def __init__(self, tags: dict, fold: callable = fold_case, substring_tags: set = None):
+        entries = {}
+        word_entries = {}
+        self.tags = {}
+        self.words = {}
+
+        for hexcode, tag_list in tags.items():
+            folded_tags = tuple(fold(t) for t in tag_list if t)
+            self.tags[hexcode] = folded_tags
+
+            for tag in folded_tags:
+                if not tag in entries:
+                    entries[tag] = set()
+
+                entries[tag].add(hexcode)
+
+            words = {w for tag in folded_tags for w in tag.split()}
+            self.words[hexcode] = tuple(words)
+
+            for word in words:
+                if not word in word_entries:
+                    word_entries[word] = set()
+
+                word_entries[word].add(hexcode)
+
+        self.table = PrefixTable(entries)
+        self.word_table = PrefixTable(word_entries)
+        self.fuzzy_index: FuzzyIndex = None
+
+        self.hexcodes_by_tag = entries
+        self.substring_tags = {fold(t) for t in substring_tags if t} if substring_tags else set()
+        self.ngram_index = NgramIndex(self.substring_tags) if self.substring_tags else None
+
+    def get_fuzzy_index(self) -> FuzzyIndex:
+        """Builds the typo-tolerant index over the single words of the tags, the first time it is used"""
+        if self.fuzzy_index is None:
+            words = {}
+            for hexcode, tags in self.tags.items():
+                for tag in tags:
+                    for word in tag.split():
+                        if len(word) < FUZZY_MIN_LENGTH:
+                            continue
+
+                        if not word in words:
+                            words[word] = set()
+
+                        words[word].add(hexcode)
+
+            self.fuzzy_index = FuzzyIndex(words)
+
+        return self.fuzzy_index
+
+    def search(self, query: str) -> dict:
+        """Returns {hexcode: score} for all the emojis with a tag starting with the query"""
+        result = {}
+        for tag, hexcodes in self.table.lookup(query):
+            score = SCORE_EXACT if (tag == query) else SCORE_PREFIX
+
+            for hexcode in hexcodes:
+                if result.get(hexcode, 0) < score:
+                    result[hexcode] = score
+
+        if self.ngram_index:
+            for tag in self.ngram_index.lookup(query):
+                for hexcode in self.hexcodes_by_tag[tag]:
+                    if not hexcode in result:
+                        result[hexcode] = SCORE_SUBSTRING
+
+        return result
+
+    def search_word(self, token: str) -> set:
+        """Returns the hexcodes with a word, in any of their tags, starting with the token"""
+        result = set()
+        for word, hexcodes in self.word_table.lookup(token):
+            result.update(hexcodes)
+
+        return result
+
+    def has_word(self, hexcode: str, token: str) -> bool:
+        for word in self.words.get(hexcode, ()):
+            if word.startswith(token):
+                return True
+
+        return False
+
+    def match_score(self, hexcode: str, query: str) -> int:
+        score = 0
+        for tag in self.tags.get(hexcode, ()):
+            if tag == query:
+                return SCORE_EXACT
+            elif tag.startswith(query):
+                score = SCORE_PREFIX
+            elif (score < SCORE_SUBSTRING) and (tag in self.substring_tags) and (query in tag):
+                score = SCORE_SUBSTRING
+
+        return score
+
+
+class LRUCache():
+    """A dictionary holding at most max_size items, dropping the least recently used first"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if not key in self.items:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.items.move_to_end(key)
+        return self.items[key]
+
+    def set(self, key, value):
+        self.items[key] = value
+        self.items.move_to_end(key)
+
+        if len(self.items) > self.max_size:
+            self.items.popitem(last=False)
+
+    def clear(self):
+        self.items.clear()
+
+    def info(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.items), 'max_size': self.max_size}
+
+
+class SearchResult():
+    def __init__(self, query: str, options: tuple, scores: dict):
+        self.query = query
+        self.options = options
+        self.scores = scores
+
+
+class EmojiSearchIndex():
+    """Precomputed search structures for the emoji picker.
+
+    The English index is built right away; localized and custom tags
+    are indexed the first time they are needed and reused afterwards.
+    Every index exists in two flavours, with tags either only case-folded
+    or also stripped of their accents, built the first time each one is used.
+    """
+
+    # How many previous queries are kept around to answer backspaces
+    RESULTS_STACK_SIZE = 10
+    # How many queries have their results cached
+    RESULTS_CACHE_SIZE = 128
+
+    def __init__(self, emojis: dict, datadir: str):
+        self.emojis = emojis
+        self.datadir = datadir
+
+        # Emojis, with and without variation selectors and including every skintone,
+        # and their hexcodes, all pointing to the hexcode of the emoji shown in the list
+        self.emoji_to_hexcode = {}
+        self.hexcode_aliases = {}
+
+        for strip_fe0f in [False, True]:
+            for hexcode, e in emojis.items():
+                for variant in [e, *e.get('skintones', [])]:
+                    emoji = variant['emoji'].replace('\ufe0f', '') if strip_fe0f else variant['emoji']
+                    self.emoji_to_hexcode.setdefault(emoji, hexcode)
+
+        # the default order, to break ties without going through the emoji data
+        self.order = {}
+
+        for hexcode, e in emojis.items():
+            self.order[hexcode] = e['order']
+
+            for variant in [e, *e.get('skintones', [])]:
+                self.hexcode_aliases.setdefault(normalize_hexcode(variant['hexcode']), hexcode)
+
+        self.english_indexes: dict[callable, TagIndex] = {}
+        self.localized_indexes: dict[tuple, TagIndex] = {}
+
+        self.custom_index: TagIndex = None
+        self.custom_index_key = None
+
+        self.get_english_index(fold_case)
+
+        # Results of the last queries, each one extending the previous:
+        # typing narrows down the top result, backspaces pop it
+        self.results_stack: list[SearchResult] = []
+        self.results_cache = LRUCache(self.RESULTS_CACHE_SIZE)
+
+    def get_english_index(self, fold: callable) -> TagIndex:
+        if not fold in self.english_indexes:
+            self.english_indexes[fold] = TagIndex({hexcode: split_tags(e['tags']) for hexcode, e in self.emojis.items()}, fold)
+
+        return self.english_indexes[fold]
+
+    def get_localized_index(self, langs: tuple, fold: callable) -> TagIndex:
+        """A single index merging the tags of all the given locales"""
+        if not (langs, fold) in self.localized_indexes:
+            tags = {}
+            substring_tags = set()
+            for lang in langs:
+                for hexcode, data in get_localized_tags_data(lang, self.datadir).items():
+                    if hexcode in self.emojis:
+                        tags[hexcode] = [*tags.get(hexcode, []), *data['tags']]
+
+                        # only the tags of these locales are matched mid-word
+                        if lang in SUBSTRING_LOCALES:
+                            substring_tags.update(data['tags'])
+
+            self.localized_indexes[(langs, fold)] = TagIndex(tags, fold, substring_tags)
+
+        return self.localized_indexes[(langs, fold)]
+
+    def get_custom_index(self, config: dict, version: int, fold: callable) -> TagIndex:
+        if (version, fold) != self.custom_index_key:
+            custom_tags = {}
+            for hexcode, conf in (config or {}).items():
+                if (hexcode in self.emojis) and conf.get('tags'):
+                    custom_tags[hexcode] = split_tags(conf['tags'])
+
+            self.custom_index = TagIndex(custom_tags, fold)
+            self.custom_index_key = (version, fold)
+
+        return self.custom_index
+
+    def lookup_emoji(self, query: str) -> str:
+        """Returns the hexcode of a pasted emoji, or of any of its variants"""
+        return self.emoji_to_hexcode.get(query) or self.emoji_to_hexcode.get(query.replace('\ufe0f', ''))
+
+    def lookup_hexcode(self, query: str) -> str:
+        """Returns the hexcode of the emoji written as U+1F525, 1F525 or 1f44d-1f3fb"""
+        is_codepoint_notation = query.upper().startswith('U+')
+
+        # "A9" or "cafe" are more likely to be words than codepoints
+        if (not is_codepoint_notation) and any(len(p) < 4 for p in re.split(r'[\s,_-]+', query)):
+            return None
+
+        normalized = normalize_hexcode(query)
+        return self.hexcode_aliases.get(normalized) if normalized else None
+
+    def get_tag_indexes(self, tags_locales: list, use_localized_tags: bool, merge_english_tags: bool, fold: callable) -> list:
+        tag_indexes = []
+        localized = use_localized_tags and bool(tags_locales)
+        if localized:
+            tag_indexes.append(self.get_localized_index(tuple(tags_locales), fold))
+
+        if (not localized) or merge_english_tags:
+            tag_indexes.append(self.get_english_index(fold))
+
+        return tag_indexes
+
+    def prepare(self, tags_locales: list, use_localized_tags: bool, merge_english_tags: bool, accent_insensitive: bool = False, **kwargs):
+        """Builds ahead of time the indexes that a search with these options would use"""
+        fold = fold_accents if accent_insensitive else fold_case
+        self.get_tag_indexes(tags_locales, use_localized_tags, merge_english_tags, fold)
+
+    def cache_info(self) -> dict:
+        """Hit and miss counters of the query results cache"""
+        return self.results_cache.info()
+
+    def search(self, query: str, tags_locales: list, use_localized_tags: bool, merge_english_tags: bool,
+               fuzzy: bool = False, accent_insensitive: bool = False, history: dict = None, custom_tags: tuple = None) -> list:
+        """Returns the hexcodes matching the query, sorted by relevance.
+
+        With fuzzy enabled, emojis with a tag that is one or two typos away
+        from the query are included as well, below every regular match.
+        Custom tags are given as a (config, version) tuple, or read from the custom tags module.
+
+        Pasted emojis and "U+" codepoints are answered by a direct lookup,
+        without looking at the tags.
+        """
+
+        query_hexcode = self.lookup_emoji(query)
+        if query_hexcode:
+            return [query_hexcode]
+
+        codepoint_hexcode = self.lookup_hexcode(query)
+        if codepoint_hexcode and query.upper().startswith('U+'):
+            return [codepoint_hexcode]
+
+        if custom_tags:
+            custom_tags_config, custom_tags_version = custom_tags
+        else:
+            custom_tags_config, custom_tags_version = get_custom_tags_config(), get_custom_tags_version()
+
+        cache_key = (query, tuple(tags_locales), use_localized_tags, merge_english_tags, fuzzy, accent_insensitive, custom_tags_version)
+        scores = self.results_cache.get(cache_key)
+        if scores is not None:
+            return self.rank(scores, history)
+
+        fold = fold_accents if accent_insensitive else fold_case
+        q = fold(query)
+        custom_index = self.get_custom_index(custom_tags_config, custom_tags_version, fold)
+        tag_indexes = self.get_tag_indexes(tags_locales, use_localized_tags, merge_english_tags, fold)
+
+        options = (custom_index, *tag_indexes)
+        while self.results_stack:
+            last = self.results_stack[-1]
+            if (last.options == options) and self.can_narrow(last.query, q):
+                break
+
+            self.results_stack.pop()
+
+        if self.results_stack and (self.results_stack[-1].query == q):
+            result = self.results_stack[-1]
+        else:
+            scores = {}
+
+            if self.results_stack:
+                # The new query extends the previous one, so its results can only be a subset
+                for hexcode in self.results_stack[-1].scores:
+                    score = self.get_match_score(hexcode, q, custom_index, tag_indexes)
+                    if score:
+                        scores[hexcode] = score
+            else:
+                for hexcode, score in custom_index.search(q).items():
+                    scores[hexcode] = score + SCORE_CUSTOM_TAG
+
+                for i in tag_indexes:
+                    for hexcode, score in i.search(q).items():
+                        if scores.get(hexcode, 0) < score:
+                            scores[hexcode] = score
+
+                tokens = q.split()
+                if len(tokens) > 1:
+                    for hexcode in self.search_all_words(tokens, [custom_index, *tag_indexes]):
+                        if not hexcode in scores:
+                            scores[hexcode] = SCORE_ALL_WORDS
+
+            result = SearchResult(q, options, scores)
+            self.results_stack.append(result)
+
+            if len(self.results_stack) > self.RESULTS_STACK_SIZE:
+                self.results_stack.pop(0)
+
+        scores = dict(result.scores)
+
+        if codepoint_hexcode:
+            scores[codepoint_hexcode] = SCORE_EMOJI
+
+        if fuzzy and (len(q) >= FUZZY_MIN_LENGTH) and (not ' ' in q):
+            for hexcode, score in self.fuzzy_search(q, [custom_index, *tag_indexes]).items():
+                if not hexcode in scores:
+                    scores[hexcode] = score
+
+        self.results_cache.set(cache_key, scores)
+        return self.rank(scores, history)
+
+    def can_narrow(self, last_query: str, q: str) -> bool:
+        """Whether the results of q are a subset of the results of last_query.
+
+        Single word queries only match the beginning of a tag,
+        while longer queries also match words anywhere in the tags.
+        """
+        if not q.startswith(last_query):
+            return False
+
+        last_tokens_count = len(last_query.split())
+        return (last_tokens_count > 1) or (last_tokens_count == len(q.split()))
+
+    def search_all_words(self, tokens: list, indexes: list) -> set:
+        """Returns the hexcodes having, for each token, a word starting with it.
+
+        Every token is resolved to the set of emojis with a matching word in any of the indexes,
+        then the sets are intersected starting from the smallest one.
+        """
+        postings = []
+        for token in set(tokens):
+            posting = set()
+            for i in indexes:
+                posting.update(i.search_word(token))
+
+            if not posting:
+                return set()
+
+            postings.append(posting)
+
+        postings.sort(key=len)
+
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result.intersection_update(posting)
+
+        return result
+
+    def get_match_score(self, hexcode: str, q: str, custom_index: TagIndex, tag_indexes: list) -> int:
+        score = custom_index.match_score(hexcode, q)
+        if score:
+            score += SCORE_CUSTOM_TAG
+
+        for i in tag_indexes:
+            score = max(score, i.match_score(hexcode, q))
+
+        tokens = q.split()
+        if (not score) and (len(tokens) > 1):
+            indexes = [custom_index, *tag_indexes]
+
+            if all(any(i.has_word(hexcode, token) for i in indexes) for token in tokens):
+                score = SCORE_ALL_WORDS
+
+        return score
+
+    def fuzzy_search(self, q: str, indexes: list) -> dict:
+        max_distance = 1 if len(q) <= 4 else 2
+
+        scores = {}
+        for i in indexes:
+            for hexcode, distance in i.get_fuzzy_index().lookup(q, max_distance).items():
+                score = SCORE_FUZZY - (distance * SCORE_FUZZY_EDIT)
+
+                if scores.get(hexcode, 0) < score:
+                    scores[hexcode] = score
+
+        return scores
+
+    def rank(self, scores: dict, history: dict = None) -> list:
+        """Adds the usage bonus to each score and returns the hexcodes from the most relevant,
+        falling back to the default order of the emojis"""
+        if history:
+            scores = dict(scores)
+
+            for hexcode, usage in history.items():
+                if hexcode in scores:
+                    scores[hexcode] += min(usage.get('count', 0), MAX_SCORE_USAGE)
+
+        return sorted(scores, key=lambda h: (-scores[h], self.order[h]))
@@ -0,0 +1,70 @@
+import threading
+from queue import SimpleQueue
+from .search_index import EmojiSearchIndex
+from ..utils import idle
+
+
+class SearchWorker():
+    """Runs the searches on a background thread, so that typing never waits for them.
+
+    The search index is built and only ever used by the worker thread;
+    every request carries a snapshot of the settings, history and custom tags
+    taken on the main thread. Each request gets a new generation number:
+    requests and results that are not from the latest generation are dropped.
+    """
+
+    def __init__(self, emojis: dict, datadir: str):
+        self.emojis = emojis
+        self.datadir = datadir
+        self.search_index: EmojiSearchIndex = None
+
+        self.generation = 0
+        self.requests = SimpleQueue()
+
+        self.thread = threading.Thread(target=self.run, name='smile-search', daemon=True)
+        self.thread.start()
+
+    def search(self, query: str, options: dict, callback: callable) -> int:
+        """Schedules a search; callback is called with the list of results on the main loop,
+        unless another search is requested or the search is cancelled before"""
+        self.generation += 1
+        self.requests.put((self.generation, query, options, callback))
+
+        return self.generation
+
+    def cancel(self):
+        self.generation += 1
+
+    def prepare(self, options: dict):
+        """Builds in the background the indexes needed to search with these options"""
+        self.requests.put((None, None, options, None))
+
+    def run(self):
+        self.search_index = EmojiSearchIndex(self.emojis, self.datadir)
+
+        while True:
+            generation, query, options, callback = self.requests.get()
+
+            if generation is None:
+                try:
+                    self.search_index.prepare(**options)
+                except Exception as e:
+                    print(e)
+
+                continue
+
+            if generation != self.generation:
+                continue
+
+            try:
+                results = self.search_index.search(query, **options)
+            except Exception as e:
+                print(e)
+                continue
+
+            self.deliver(generation, results, callback)
+
+    @idle
+    def deliver(self, generation: int, results: list, callback: callable):
+        if generation == self.generation:
+            callback(results)
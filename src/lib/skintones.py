@@ -0,0 +1,32 @@
+from typing import Optional
+from .emoji_data import emojis
+
+SKINTONE_MODIFIERS = ['1F3FB', '1F3FC', '1F3FD', '1F3FE', '1F3FF']
+
+# (base hexcode, modifier) -> skintone variant, built the first time it is needed
+skintone_variants: dict = None
+
+def get_skintone_variants() -> dict:
+    """Maps every emoji with skintones and every modifier to the variant shown for that modifier,
+    which is the first one, in the order of the data, containing the modifier"""
+    global skintone_variants
+
+    if skintone_variants is None:
+        skintone_variants = {}
+
+        for emoji in emojis.values():
+            for tone in emoji.get('skintones', []):
+                for modifier in SKINTONE_MODIFIERS:
+                    if f'-{modifier}' in tone['hexcode']:
+                        skintone_variants.setdefault((emoji['hexcode'], modifier), tone)
+
+    return skintone_variants
+
+def get_skintone_variant(hexcode: str, modifier: str) -> Optional[dict]:
+    if not modifier:
+        return None
+
+    return get_skintone_variants().get((hexcode, modifier))
+
+def get_skintones(hexcode: str) -> list[dict]:
+    return emojis[hexcode].get('skintones', []) if hexcode in emojis else []
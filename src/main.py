@@ -1,12 +1,8 @@
-import manimpango
 import sys
 import gi
 
-from .utils import make_option, portal
+from .utils import make_option
 from .Picker import Picker
-from .ShortcutsWindow import ShortcutsWindow
-from .Settings import Settings
-from .components.UpdateDialog import UpdateDialog
 from .lib.DbusService import DbusService, GNOME_EXTENSION_LINK
 
 gi.require_version('Gtk', '4.0')
@@ -45,12 +41,19 @@ class Smile(Adw.Application):
     def do_startup(self):
         Adw.Application.do_startup(self)
 
-        manimpango.register_font(self.datadir + '/assets/NotoColorEmoji.ttf')
+        # Before any text is laid out: fontconfig would not pick up a font added in the middle
+        # of a layout, and the bundled font is subset so registering it is quick
+        self.register_emoji_font()
+
         css_provider = Gtk.CssProvider()
         css_provider.load_from_resource('/it/mijorus/smile/assets/style.css')
         Gtk.StyleContext.add_provider_for_display(Gdk.Display.get_default(), css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
         self.settings = Gio.Settings.new(self.application_id)
 
+    def register_emoji_font(self):
+        import manimpango
+        manimpango.register_font(self.datadir + '/assets/NotoColorEmoji.ttf')
+
     def do_activate(self):
         # We only allow a single window and raise any existing ones
         if not self.window:
@@ -59,7 +62,7 @@ class Smile(Adw.Application):
             self.window = Picker(application=self)
 
             self.create_action("preferences", lambda w, e: self.on_preferences_action())
-            self.create_action("open_shortcuts", lambda w, e: ShortcutsWindow().open())
+            self.create_action("open_shortcuts", lambda w, e: self.on_shortcuts_action())
             self.create_action("open_changelog", lambda w, e: Gtk.UriLauncher.new('https://smile.mijorus.it/changelog').launch())
             self.create_action("translate", lambda w, e: Gtk.UriLauncher.new('https://github.com/mijorus/smile/tree/master/po').launch())
             self.create_action("gnome_extension", lambda w, e: Gtk.UriLauncher.new(GNOME_EXTENSION_LINK).launch())
@@ -73,6 +76,7 @@ class Smile(Adw.Application):
                 last_run_version = self.settings.get_string('last-run-version').replace('.', '')
                 last_run_version = int(last_run_version if len(last_run_version) else '-1')
 
+                from .components.UpdateDialog import UpdateDialog
                 UpdateDialog.show(self.window, last_run_version, self.version)
 
                 self.settings.set_string('last-run-version', self.version)
@@ -82,9 +86,16 @@ class Smile(Adw.Application):
             self.window.on_activation()
 
     def on_preferences_action(self):
+        # The secondary windows are imported when first opened, the picker does not need them
+        from .Settings import Settings
+
         pref_window = Settings(self.application_id, transient_for=self.window)
         pref_window.present()
 
+    def on_shortcuts_action(self):
+        from .ShortcutsWindow import ShortcutsWindow
+        ShortcutsWindow().open()
+
     def create_action(self, name, callback):
         """ Add an Action and connect to a callback """
         action = Gio.SimpleAction.new(name, None)
@@ -1,25 +1,5 @@
-import dbus
-from threading import Timer
 from gi.repository import GLib, Gio
 
-_tags_cache = {}
-def tag_list_contains(tags: str, q: str) -> bool:
-    global _tags_cache
-
-    q = q.lower()
-
-    if tags in _tags_cache:
-        tags_arr = _tags_cache[tags]
-    else:
-        tags_arr = tags.replace(', ', ',').split(',')
-        _tags_cache[tags] = tags_arr
-
-    for t in tags_arr:
-        if t.lower().startswith(q):
-            return True
-    
-    return False
-
 # thank you mate ❤️
 # https://github.com/gtimelog/gtimelog/blob/6e4b07b58c730777dbdb00b3b85291139f8b10aa/src/gtimelog/main.py#L159
 def make_option(long_name, short_name=None, flags=0, arg=GLib.OptionArg.NONE, arg_data=None, description=None, arg_description=None):
@@ -42,7 +22,10 @@ def read_text_resource(res: str) -> str:
     file.unref()
     return decoded
 
-def portal(interface: str, bus_name: str='org.freedesktop.portal.Desktop', object_path: str='/org/freedesktop/portal/desktop') -> dbus.Interface:
+def portal(interface: str, bus_name: str='org.freedesktop.portal.Desktop', object_path: str='/org/freedesktop/portal/desktop') -> 'dbus.Interface':
+    # dbus-python is only needed by the settings, keep it out of the startup
+    import dbus
+
     bus = dbus.SessionBus()
     obj = bus.get_object(bus_name, object_path)
     inter = dbus.Interface(obj, interface)
@@ -52,17 +35,20 @@ def portal(interface: str, bus_name: str='org.freedesktop.portal.Desktop', objec
 def debounce(wait):
     """ Decorator that will postpone a functions
         execution until after wait seconds
-        have elapsed since the last time it was invoked. """
+        have elapsed since the last time it was invoked.
+
+        The call is scheduled as a timeout on the GLib main loop,
+        each new invocation replaces the pending one. """
     def decorator(fn):
         def debounced(*args, **kwargs):
             def call_it():
+                debounced.source_id = None
                 fn(*args, **kwargs)
-            try:
-                debounced.t.cancel()
-            except(AttributeError):
-                pass
-            debounced.t = Timer(wait, call_it)
-            debounced.t.start()
+
+            cancel_timeout(debounced.source_id)
+            debounced.source_id = timeout(wait, call_it)
+
+        debounced.source_id = None
         return debounced
     return decorator
 
@@ -70,4 +56,16 @@ def debounce(wait):
 def idle(func):
     def wrapper(*args, **kwargs):
         GLib.idle_add(func, *args)
-    return wrapper
\ No newline at end of file
+    return wrapper
+
+def timeout(wait: float, func: callable, *args) -> int:
+    """Runs func once on the main loop after wait seconds, returns the id of the GLib source"""
+    def call_it():
+        func(*args)
+        return GLib.SOURCE_REMOVE
+
+    return GLib.timeout_add(int(wait * 1000), call_it)
+
+def cancel_timeout(source_id: int):
+    if source_id:
+        GLib.source_remove(source_id)